@@ -4,7 +4,6 @@ from SONALI_MUSIC.core.git import git
 from SONALI_MUSIC.core.userbot import Userbot
 from SONALI_MUSIC.misc import dbb, heroku
 
-from SafoneAPI import SafoneAPI
 from .logging import LOGGER
 
 dirr()
@@ -13,10 +12,19 @@ dbb()
 heroku()
 
 app = Sona()
-api = SafoneAPI()
 userbot = Userbot()
 
 
+def __getattr__(name):
+    # SafoneAPI is slow to import and rarely used, build it on first access.
+    if name == "api":
+        from SafoneAPI import SafoneAPI
+
+        globals()["api"] = SafoneAPI()
+        return globals()["api"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 from .platforms import *
 
 Apple = AppleAPI()
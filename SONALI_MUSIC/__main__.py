@@ -1,5 +1,7 @@
 import asyncio
-import importlib
+import time
+
+import psutil
 
 from pyrogram import idle
 from pytgcalls.exceptions import NoActiveGroupCall
@@ -7,9 +9,14 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from SONALI_MUSIC import LOGGER, app, userbot
 from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.loader import load_plugins
+from SONALI_MUSIC.core.router import install_router
 from SONALI_MUSIC.misc import sudo
 from SONALI_MUSIC.plugins import ALL_MODULES
 from SONALI_MUSIC.utils.database import get_banned_users, get_gbanned
+from SONALI_MUSIC.utils.state import shard_guard, store
+from SONALI_MUSIC.utils.sys import sample_stats
+from SONALI_MUSIC.utils.workers import start_workers, stop_workers
 from config import BANNED_USERS
 
 
@@ -33,9 +40,13 @@ async def init():
             BANNED_USERS.add(user_id)
     except:
         pass
+    await store.reset()
+    await start_workers()
     await app.start()
-    for all_module in ALL_MODULES:
-        importlib.import_module("SONALI_MUSIC.plugins" + all_module)
+    if config.COMMAND_ROUTER == str(True):
+        install_router(app)
+    shard_guard(app)
+    load_plugins(app, ALL_MODULES)
     LOGGER("SONALI_MUSIC.plugins").info("𝐀𝐥𝐥 𝐅𝐞𝐚𝐭𝐮𝐫𝐞𝐬 𝐋𝐨𝐚𝐝𝐞𝐝 𝐁𝐚𝐛𝐲🥳...")
     await userbot.start()
     await Sona.start()
@@ -49,12 +60,17 @@ async def init():
     except:
         pass
     await Sona.decorators()
+    asyncio.create_task(sample_stats())
+    LOGGER("SONALI_MUSIC").info(
+        f"Started in {time.time() - psutil.Process().create_time():.2f}s."
+    )
     LOGGER("SONALI_MUSIC").info(
         "╔═════ஜ۩۞۩ஜ════╗\n  ☠︎︎𝗠𝗔𝗗𝗘 𝗕𝗬 𝗦𝗣𝗔𝗥𝗦𝗛☠︎︎\n╚═════ஜ۩۞۩ஜ════╝"
     )
     await idle()
     await app.stop()
     await userbot.stop()
+    stop_workers()
     LOGGER("SONALI_MUSIC").info("𝗦𝗧𝗢𝗣 𝗦𝗢𝗡𝗔𝗟𝗜 𝗠𝗨𝗦𝗜𝗖 𝗕𝗢𝗧..")
 
 
@@ -1,6 +1,4 @@
 import asyncio
-import os
-from datetime import datetime, timedelta
 from typing import Union
 
 from pyrogram import Client
@@ -11,7 +9,11 @@ from pytgcalls.exceptions import (
     NoActiveGroupCall,
     TelegramServerError,
 )
-from pytgcalls.types import Update
+from pytgcalls.types import (
+    JoinedGroupCallParticipant,
+    LeftGroupCallParticipant,
+    Update,
+)
 from pytgcalls.types.input_stream import AudioPiped, AudioVideoPiped
 from pytgcalls.types.input_stream.quality import HighQualityAudio, MediumQualityVideo
 from pytgcalls.types.stream import StreamAudioEnded
@@ -25,6 +27,7 @@ from SONALI_MUSIC.utils.database import (
     get_lang,
     get_loop,
     group_assistant,
+    is_active_chat,
     is_autoend,
     music_on,
     remove_active_chat,
@@ -32,22 +35,46 @@ from SONALI_MUSIC.utils.database import (
     set_loop,
 )
 from SONALI_MUSIC.utils.exceptions import AssistantErr
-from SONALI_MUSIC.utils.formatters import check_duration, seconds_to_min, speed_converter
+from SONALI_MUSIC.utils.formatters import seconds_to_min, time_to_seconds
 from SONALI_MUSIC.utils.inline.play import stream_markup
+from SONALI_MUSIC.utils.scheduler import scheduler
 from SONALI_MUSIC.utils.stream.autoclear import auto_clean
+from SONALI_MUSIC.utils.stream.playback import get_variant, prerender, speed_filter
+from SONALI_MUSIC.utils.stream.queue import Queue
+from SONALI_MUSIC.utils.stream.relay import live_url
+from SONALI_MUSIC.utils.stream.transcode import audio_stream
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 from strings import get_string
 
-autoend = {}
-counter = {}
+# chat_id -> people in the voice chat besides the assistant, only kept while
+# autoend is on.
+listeners = {}
 
 
 async def _clear_(chat_id):
-    db[chat_id] = []
+    db[chat_id] = Queue()
+    listeners.pop(chat_id, None)
+    scheduler.cancel(("autoend", chat_id))
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
 
 
+async def _autoend_(chat_id):
+    if not await is_active_chat(chat_id):
+        return
+    try:
+        await Sona.stop_stream(chat_id)
+    except:
+        return
+    try:
+        await app.send_message(
+            chat_id,
+            "» ʙᴏᴛ ᴀᴜᴛᴏᴍᴀᴛɪᴄᴀʟʟʏ ʟᴇғᴛ ᴠɪᴅᴇᴏᴄʜᴀᴛ ʙᴇᴄᴀᴜsᴇ ɴᴏ ᴏɴᴇ ᴡᴀs ʟɪsᴛᴇɴɪɴɢ ᴏɴ ᴠɪᴅᴇᴏᴄʜᴀᴛ.",
+        )
+    except:
+        pass
+
+
 class Call(PyTgCalls):
     def __init__(self):
         self.userbot1 = Client(
@@ -150,56 +177,32 @@ class Call(PyTgCalls):
 
     async def speedup_stream(self, chat_id: int, file_path, speed, playing):
         assistant = await group_assistant(self, chat_id)
+        seconds = int(playing[0].get("old_second") or playing[0]["seconds"])
+        position = int(playing[0]["played"] * float(playing[0].get("speed") or 1.0))
+        played = int(position / float(speed))
+        dur = int(seconds / float(speed))
+        duration = seconds_to_min(dur)
+        out = None
         if str(speed) != str("1.0"):
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == str("0.5"):
-                    vs = 2.0
-                if str(speed) == str("0.75"):
-                    vs = 1.35
-                if str(speed) == str("1.5"):
-                    vs = 0.68
-                if str(speed) == str("2.0"):
-                    vs = 0.5
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await proc.communicate()
-            else:
-                pass
+            out = get_variant(file_path, speed)
+        if out:
+            ffmpeg = f"-ss {played} -to {dur}"
+        elif str(speed) != str("1.0"):
+            ffmpeg = f"-ss {position} -to {seconds} {speed_filter(speed)}"
         else:
-            out = file_path
-        dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
+            ffmpeg = f"-ss {position} -to {seconds}"
         stream = (
             AudioVideoPiped(
-                out,
+                out or file_path,
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=ffmpeg,
             )
             if playing[0]["streamtype"] == "video"
             else AudioPiped(
-                out,
+                out or file_path,
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=ffmpeg,
             )
         )
         if str(db[chat_id][0]["file"]) == str(file_path):
@@ -211,17 +214,19 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
+            db[chat_id][0]["played"] = played
             db[chat_id][0]["dur"] = duration
             db[chat_id][0]["seconds"] = dur
             db[chat_id][0]["speed_path"] = out
             db[chat_id][0]["speed"] = speed
+            if not out and str(speed) != str("1.0"):
+                prerender(file_path, speed)
 
     async def force_stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         try:
             check = db.get(chat_id)
-            check.pop(0)
+            check.popleft()
         except:
             pass
         await remove_active_video_chat(chat_id)
@@ -246,26 +251,34 @@ class Call(PyTgCalls):
                 video_parameters=MediumQualityVideo(),
             )
         else:
-            stream = AudioPiped(link, audio_parameters=HighQualityAudio())
+            stream = audio_stream(link)
         await assistant.change_stream(
             chat_id,
             stream,
         )
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, speed=None):
         assistant = await group_assistant(self, chat_id)
+        ffmpeg = f"-ss {to_seek} -to {duration}"
+        if speed and str(speed) != str("1.0"):
+            speed = float(speed)
+            ffmpeg = (
+                f"-ss {int(time_to_seconds(to_seek) * speed)} "
+                f"-to {int(time_to_seconds(duration) * speed)} "
+                f"{speed_filter(speed)}"
+            )
         stream = (
             AudioVideoPiped(
                 file_path,
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                additional_ffmpeg_parameters=ffmpeg,
             )
             if mode == "video"
             else AudioPiped(
                 file_path,
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                additional_ffmpeg_parameters=ffmpeg,
             )
         )
         await assistant.change_stream(chat_id, stream)
@@ -305,7 +318,7 @@ class Call(PyTgCalls):
                     video_parameters=MediumQualityVideo(),
                 )
                 if video
-                else AudioPiped(link, audio_parameters=HighQualityAudio())
+                else audio_stream(link)
             )
         try:
             await assistant.join_group_call(
@@ -324,10 +337,10 @@ class Call(PyTgCalls):
         if video:
             await add_active_video_chat(chat_id)
         if await is_autoend():
-            counter[chat_id] = {}
             users = len(await assistant.get_participants(chat_id))
+            listeners[chat_id] = users - 1
             if users == 1:
-                autoend[chat_id] = datetime.now() + timedelta(minutes=1)
+                scheduler.schedule(("autoend", chat_id), 60, _autoend_, chat_id)
 
     async def change_stream(self, client, chat_id):
         check = db.get(chat_id)
@@ -335,7 +348,7 @@ class Call(PyTgCalls):
         loop = await get_loop(chat_id)
         try:
             if loop == 0:
-                popped = check.pop(0)
+                popped = check.popleft()
             else:
                 loop = loop - 1
                 await set_loop(chat_id, loop)
@@ -367,8 +380,8 @@ class Call(PyTgCalls):
                 db[chat_id][0]["speed"] = 1.0
             video = True if str(streamtype) == "video" else False
             if "live_" in queued:
-                n, link = await YouTube.video(videoid, True)
-                if n == 0:
+                link = await live_url(videoid)
+                if not link:
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
@@ -404,7 +417,7 @@ class Call(PyTgCalls):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "tg"
             elif "vid_" in queued:
                 mystic = await app.send_message(original_chat_id, _["call_7"])
@@ -426,10 +439,7 @@ class Call(PyTgCalls):
                         video_parameters=MediumQualityVideo(),
                     )
                 else:
-                    stream = AudioPiped(
-                        file_path,
-                        audio_parameters=HighQualityAudio(),
-                    )
+                    stream = audio_stream(file_path)
                 try:
                     await client.change_stream(chat_id, stream)
                 except:
@@ -451,7 +461,7 @@ class Call(PyTgCalls):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "stream"
             elif "index_" in queued:
                 stream = (
@@ -477,7 +487,7 @@ class Call(PyTgCalls):
                     caption=_["stream_2"].format(user),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "tg"
             else:
                 if video:
@@ -487,10 +497,7 @@ class Call(PyTgCalls):
                         video_parameters=MediumQualityVideo(),
                     )
                 else:
-                    stream = AudioPiped(
-                        queued,
-                        audio_parameters=HighQualityAudio(),
-                    )
+                    stream = audio_stream(queued)
                 try:
                     await client.change_stream(chat_id, stream)
                 except:
@@ -510,7 +517,7 @@ class Call(PyTgCalls):
                         ),
                         reply_markup=InlineKeyboardMarkup(button),
                     )
-                    db[chat_id][0]["mystic"] = run
+                    db[chat_id][0]["mystic"] = run.id
                     db[chat_id][0]["markup"] = "tg"
                 elif videoid == "soundcloud":
                     button = stream_markup(_, chat_id)
@@ -522,7 +529,7 @@ class Call(PyTgCalls):
                         ),
                         reply_markup=InlineKeyboardMarkup(button),
                     )
-                    db[chat_id][0]["mystic"] = run
+                    db[chat_id][0]["mystic"] = run.id
                     db[chat_id][0]["markup"] = "tg"
                 else:
                     img = await get_thumb(videoid)
@@ -538,7 +545,7 @@ class Call(PyTgCalls):
                         ),
                         reply_markup=InlineKeyboardMarkup(button),
                     )
-                    db[chat_id][0]["mystic"] = run
+                    db[chat_id][0]["mystic"] = run.id
                     db[chat_id][0]["markup"] = "stream"
 
     async def ping(self):
@@ -597,5 +604,22 @@ class Call(PyTgCalls):
                 return
             await self.change_stream(client, update.chat_id)
 
+        @self.one.on_participants_change()
+        @self.two.on_participants_change()
+        @self.three.on_participants_change()
+        @self.four.on_participants_change()
+        @self.five.on_participants_change()
+        async def participants_change_handler(client, update: Update):
+            chat_id = update.chat_id
+            if chat_id not in listeners:
+                return
+            if isinstance(update, JoinedGroupCallParticipant):
+                listeners[chat_id] += 1
+                scheduler.cancel(("autoend", chat_id))
+            elif isinstance(update, LeftGroupCallParticipant):
+                listeners[chat_id] = max(0, listeners[chat_id] - 1)
+                if not listeners[chat_id]:
+                    scheduler.schedule(("autoend", chat_id), 60, _autoend_, chat_id)
+
 
 Sona = Call()
@@ -0,0 +1,194 @@
+import ast
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from functools import reduce
+from operator import or_
+
+from pyrogram import ContinuePropagation, StopPropagation, filters
+from pyrogram.handlers import MessageHandler
+
+import config
+
+from ..logging import LOGGER
+
+PLUGINS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "plugins")
+MANIFEST_PATH = os.path.join("cache", "plugins.manifest")
+
+# Only these packages may be deferred, music controls always load eagerly.
+LAZY_PACKAGES = ("tools", "mics", "Yumi", "sudo")
+LAZY_GROUP = -100
+
+import_times = {}
+pending = {}
+stub = None
+
+
+def _scan(path: str):
+    # Returns the commands/prefixes of a plugin that only has command handlers
+    # and no module level calls, None when it has to be imported eagerly.
+    tree = ast.parse(open(path, encoding="utf8").read())
+    commands, prefixes, handlers = set(), set(), 0
+    for node in tree.body:
+        if isinstance(node, ast.Expr) and not isinstance(node.value, ast.Constant):
+            return None
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for deco in node.decorator_list:
+            if not isinstance(deco, ast.Call) or not isinstance(deco.func, ast.Attribute):
+                continue
+            if not deco.func.attr.startswith("on_"):
+                continue
+            if deco.func.attr != "on_message":
+                return None
+            found = False
+            for call in ast.walk(deco):
+                if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Attribute):
+                    continue
+                if call.func.attr != "command" or not call.args:
+                    continue
+                try:
+                    cmds = ast.literal_eval(call.args[0])
+                    pref = "/"
+                    for kw in call.keywords:
+                        if kw.arg == "prefixes":
+                            pref = ast.literal_eval(kw.value)
+                except Exception:
+                    return None
+                commands.update([cmds] if isinstance(cmds, str) else cmds)
+                prefixes.update([pref] if isinstance(pref, str) else pref)
+                found = True
+            if not found:
+                return None
+            handlers += 1
+    if not handlers:
+        return None
+    return {"commands": sorted(commands), "prefixes": sorted(prefixes)}
+
+
+def build_manifest(modules) -> dict:
+    try:
+        with open(MANIFEST_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    manifest = {}
+    for module in modules:
+        if module.split(".")[1] not in LAZY_PACKAGES:
+            continue
+        path = os.path.join(PLUGINS_DIR, *module.split(".")[1:]) + ".py"
+        stat = os.stat(path)
+        key = f"{stat.st_mtime_ns}:{stat.st_size}"
+        entry = cached.get(module)
+        if not entry or entry["key"] != key:
+            entry = {"key": key, "lazy": _scan(path)}
+        manifest[module] = entry
+    try:
+        with open(MANIFEST_PATH, "w") as f:
+            json.dump(manifest, f)
+    except OSError:
+        pass
+    return manifest
+
+
+def _import(app, name: str):
+    # Collects the handlers the module registers so the first update can be replayed.
+    captured = []
+    add_handler = app.add_handler
+
+    def capture(handler, group: int = 0):
+        captured.append((group, handler))
+        return add_handler(handler, group)
+
+    app.add_handler = capture
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    finally:
+        app.add_handler = add_handler
+    import_times[name] = time.perf_counter() - start
+    return captured
+
+
+async def _replay(app, captured, message):
+    groups = {}
+    for group, handler in captured:
+        groups.setdefault(group, []).append(handler)
+    for group in sorted(groups):
+        for handler in groups[group]:
+            try:
+                if await handler.check(app, message):
+                    if inspect.iscoroutinefunction(handler.callback):
+                        await handler.callback(app, message)
+                    else:
+                        await app.loop.run_in_executor(
+                            app.executor, handler.callback, app, message
+                        )
+                    break
+            except StopPropagation:
+                return
+            except ContinuePropagation:
+                continue
+            except Exception as e:
+                LOGGER(__name__).error(f"Lazy handler failed: {e}")
+                break
+
+
+async def lazy_dispatch(app, message):
+    global stub
+    if not message.command:
+        return
+    for name in pending.get(message.command[0].lower(), []).copy():
+        for command, names in list(pending.items()):
+            if name in names:
+                names.remove(name)
+            if not names:
+                del pending[command]
+        try:
+            captured = _import(app, f"SONALI_MUSIC.plugins{name}")
+        except Exception as e:
+            LOGGER(__name__).error(f"Failed to load {name}: {e}")
+            continue
+        LOGGER(__name__).info(
+            f"Loaded {name} on first use in {import_times[f'SONALI_MUSIC.plugins{name}']:.2f}s."
+        )
+        await _replay(app, captured, message)
+    if not pending and stub:
+        app.remove_handler(stub, LAZY_GROUP)
+        stub = None
+
+
+def load_plugins(app, modules):
+    global stub
+    manifest = {}
+    if config.LAZY_PLUGINS == str(True):
+        manifest = build_manifest(modules)
+    lazy = []
+    for module in modules:
+        name = "SONALI_MUSIC.plugins" + module
+        if name in sys.modules or not (manifest.get(module) or {}).get("lazy"):
+            if name not in sys.modules:
+                _import(app, name)
+            continue
+        lazy.append(module)
+    # Modules imported by eager plugins are already registered, skip their stubs.
+    lazy = [m for m in lazy if "SONALI_MUSIC.plugins" + m not in sys.modules]
+    stubs = []
+    for module in lazy:
+        entry = manifest[module]["lazy"]
+        for command in entry["commands"]:
+            pending.setdefault(command.lower(), []).append(module)
+        stubs.append(filters.command(entry["commands"], prefixes=entry["prefixes"]))
+    if stubs:
+        stub = MessageHandler(lazy_dispatch, reduce(or_, stubs))
+        app.add_handler(stub, LAZY_GROUP)
+    slowest = sorted(import_times.items(), key=lambda x: x[1], reverse=True)[:5]
+    LOGGER(__name__).info(
+        f"Imported {len(modules) - len(lazy)} plugins in {sum(import_times.values()):.2f}s, "
+        f"{len(lazy)} deferred until first use. Slowest: "
+        + ", ".join(f"{n.rsplit('.', 1)[-1]} {t:.2f}s" for n, t in slowest)
+    )
+    return lazy
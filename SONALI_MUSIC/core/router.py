@@ -0,0 +1,192 @@
+import inspect
+import re
+import time
+
+from pyrogram.handlers import CallbackQueryHandler, MessageHandler
+
+from ..logging import LOGGER
+
+# "module.function" -> [calls, seconds spent in the callback]
+handler_stats = {}
+
+literal_re = re.compile(r"[A-Za-z0-9_:\- ]+")
+
+
+def _name(handler) -> str:
+    func = getattr(handler, "original_callback", None) or handler.callback
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _commands(flt):
+    # The commands a filter can never match without, None when it has none.
+    kind = type(flt).__name__
+    if kind == "CommandFilter":
+        return {c.lower().split()[0] for c in flt.commands}, set(flt.prefixes)
+    if kind == "AndFilter":
+        return _commands(flt.base) or _commands(flt.other)
+    if kind == "OrFilter":
+        base, other = _commands(flt.base), _commands(flt.other)
+        if base and other:
+            return base[0] | other[0], base[1] | other[1]
+    return None
+
+
+def _literal(flt):
+    # The plain text a callback regex needs in the data, None when there is none.
+    kind = type(flt).__name__
+    if kind == "RegexFilter" and not flt.p.flags & re.IGNORECASE:
+        pattern = flt.p.pattern
+        anchored = pattern.startswith("^")
+        body = pattern[1:] if anchored else pattern
+        match = literal_re.match(body)
+        if not match:
+            return None
+        literal = match.group(0)
+        if body[len(literal) : len(literal) + 1] in ("?", "*", "{"):
+            literal = literal[:-1]
+        return (anchored, literal) if literal else None
+    if kind == "AndFilter":
+        return _literal(flt.base) or _literal(flt.other)
+    return None
+
+
+class _Router:
+    # Stands in for every indexed handler of one group, the real handler is
+    # only checked when the update can possibly match it.
+    def _setup(self):
+        self.callback = self.dispatch
+        self.handlers = []
+        self.matched = {}
+
+    def add(self, handler, key):
+        self.handlers.append((handler, key))
+        self.rebuild()
+
+    def remove(self, handler):
+        self.handlers = [(h, k) for h, k in self.handlers if h is not handler]
+        self.rebuild()
+
+    async def check(self, client, update):
+        for handler in self.candidates(client, update):
+            if await handler.check(client, update):
+                self.matched[id(update)] = handler
+                return True
+        return False
+
+    async def dispatch(self, client, update):
+        handler = self.matched.pop(id(update))
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(handler.callback):
+                await handler.callback(client, update)
+            else:
+                await client.loop.run_in_executor(
+                    client.executor, handler.callback, client, update
+                )
+        finally:
+            stats = handler_stats.setdefault(_name(handler), [0, 0.0])
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+
+
+class CommandRouter(_Router, MessageHandler):
+    def __init__(self):
+        MessageHandler.__init__(self, None)
+        self._setup()
+
+    def rebuild(self):
+        self.index = {}
+        self.prefixes = set()
+        for order, (handler, (commands, prefixes)) in enumerate(self.handlers):
+            self.prefixes |= prefixes
+            for command in commands:
+                self.index.setdefault(command, []).append((order, handler))
+
+    def candidates(self, client, message):
+        text = message.text or message.caption
+        if not text:
+            return []
+        found = []
+        for prefix in self.prefixes:
+            if not text.startswith(prefix):
+                continue
+            word = text[len(prefix) :].split(maxsplit=1)
+            if not word:
+                continue
+            word = word[0].split("@")[0].lower()
+            username = (client.username or "").lower()
+            if username and word.endswith(username) and word != username:
+                word = word[: -len(username)]
+            found += self.index.get(word, [])
+        return [handler for _, handler in sorted(set(found), key=lambda x: x[0])]
+
+
+class CallbackRouter(_Router, CallbackQueryHandler):
+    def __init__(self):
+        CallbackQueryHandler.__init__(self, None)
+        self._setup()
+
+    def rebuild(self):
+        self.index = list(self.handlers)
+
+    def candidates(self, client, query):
+        data = query.data
+        if isinstance(data, bytes):
+            data = data.decode(errors="ignore")
+        if not data:
+            return []
+        return [
+            handler
+            for handler, (anchored, literal) in self.index
+            if (data.startswith(literal) if anchored else literal in data)
+        ]
+
+
+def install_router(app):
+    # Command and callback handlers are filed into one router per group instead
+    # of pyrogram testing each of their filters against every update.
+    add_handler, remove_handler = app.add_handler, app.remove_handler
+    routers = {}
+
+    def locked(func, *args):
+        # Like pyrogram's own add_handler, the index only changes once the
+        # updates being dispatched are done, so a handler added while an
+        # update walks the groups (lazy plugins) is not run for it as well.
+        async def fn():
+            for lock in app.dispatcher.locks_list:
+                await lock.acquire()
+            try:
+                func(*args)
+            finally:
+                for lock in app.dispatcher.locks_list:
+                    lock.release()
+
+        app.loop.create_task(fn())
+
+    def route(handler, group: int = 0):
+        if not handler.filters:
+            return add_handler(handler, group)
+        if type(handler) is MessageHandler:
+            router_class, key = CommandRouter, _commands(handler.filters)
+        elif type(handler) is CallbackQueryHandler:
+            router_class, key = CallbackRouter, _literal(handler.filters)
+        else:
+            return add_handler(handler, group)
+        if not key:
+            return add_handler(handler, group)
+        router = routers.get((router_class, group))
+        if not router:
+            router = routers[(router_class, group)] = router_class()
+            add_handler(router, group)
+        locked(router.add, handler, key)
+
+    def unroute(handler, group: int = 0):
+        for (_, router_group), router in routers.items():
+            if router_group == group and any(h is handler for h, _ in router.handlers):
+                return locked(router.remove, handler)
+        return remove_handler(handler, group)
+
+    app.add_handler = route
+    app.remove_handler = unroute
+    app.routers = routers
+    LOGGER(__name__).info("Command router installed.")
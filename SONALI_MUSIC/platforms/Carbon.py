@@ -1,8 +1,20 @@
+import hashlib
+import os
 import random
+import re
+import unicodedata
+from functools import lru_cache
 from os.path import realpath
 
 import aiohttp
 from aiohttp import client_exceptions
+from PIL import Image, ImageDraw, ImageFont
+from unidecode import unidecode
+
+import config
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.cache import trim_files
+from SONALI_MUSIC.utils.workers import run_in_worker
 
 
 class UnableToFetchCarbon(Exception):
@@ -67,6 +79,82 @@ colour = [
 ]
 
 
+FONT_PATH = "SONALI_MUSIC/assets/font.ttf"
+
+# window, text, number, symbol, link
+palettes = [
+    ("#282a36", "#f8f8f2", "#bd93f9", "#ff79c6", "#8be9fd"),
+    ("#2e3440", "#d8dee9", "#b48ead", "#81a1c1", "#88c0d0"),
+    ("#272822", "#f8f8f2", "#ae81ff", "#f92672", "#66d9ef"),
+    ("#011627", "#d6deeb", "#f78c6c", "#c792ea", "#7fdbca"),
+    ("#1e1e1e", "#d4d4d4", "#b5cea8", "#569cd6", "#4ec9b0"),
+]
+
+token_re = re.compile(r"(https?://\S+|\d+(?:[.:]\d+)*|[^\w\s]+|\s+|\w+)")
+
+
+@lru_cache(maxsize=4)
+def _font(size: int):
+    return ImageFont.truetype(FONT_PATH, size)
+
+
+@lru_cache(maxsize=4096)
+def _glyph(char: str) -> str:
+    # Fancy unicode the font cannot draw is swapped for its ascii look-alike.
+    font = _font(26)
+    missing = "\U0010fffd"
+    if char.isspace() or (font.getbbox(char), font.getlength(char)) != (
+        font.getbbox(missing),
+        font.getlength(missing),
+    ):
+        return char
+    if unidecode(char):
+        return unidecode(char)
+    return "" if unicodedata.category(char).startswith("L") else "•"
+
+
+def _colour(token: str, palette) -> str:
+    if token.startswith("http"):
+        return palette[4]
+    if token[0].isdigit():
+        return palette[2]
+    if not token[0].isalnum() and not token[0].isspace():
+        return palette[3]
+    return palette[1]
+
+
+def render_carbon(text: str, background: str, palette, out: str) -> str:
+    font = _font(26)
+    text = "".join(_glyph(char) for char in text.expandtabs(4))
+    lines = text.splitlines() or [""]
+    line_height = font.getbbox("Ay")[3] + 10
+    width = int(max(font.getlength(line) for line in lines)) + 80
+    height = line_height * len(lines) + 100
+    image = Image.new("RGB", (width + 120, height + 120), background)
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle(
+        (60, 60, width + 60, height + 60), radius=14, fill=palette[0]
+    )
+    for i, dot in enumerate(("#ff5f56", "#ffbd2e", "#27c93f")):
+        x = 90 + i * 28
+        draw.ellipse((x, 84, x + 16, 100), fill=dot)
+    y = 130
+    for line in lines:
+        x = 100
+        for token in token_re.findall(line):
+            draw.text((x, y), token, font=font, fill=_colour(token, palette))
+            x += font.getlength(token)
+        y += line_height
+    part = f"{out}.part"
+    try:
+        image.save(part, "PNG")
+        os.replace(part, out)
+    finally:
+        if os.path.exists(part):
+            os.remove(part)
+    return out
+
+
 class CarbonAPI:
     def __init__(self):
         self.language = "auto"
@@ -77,7 +165,38 @@ class CarbonAPI:
         self.width_adjustment = True
         self.watermark = False
 
-    async def generate(self, text: str, user_id):
+    async def generate(self, text: str, user_id=None, cache: bool = True):
+        # Cached renders are reused by text, one-off ones are for the caller to remove.
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        name = "carbon" if cache else "carbon_tmp"
+        out = realpath(f"cache/{name}_{digest[:16]}.png")
+        if cache and os.path.isfile(out):
+            try:
+                os.utime(out)
+                return out
+            except OSError:
+                pass
+        seed = int(digest, 16)
+        try:
+            await run_in_worker(
+                render_carbon,
+                text,
+                colour[seed % len(colour)],
+                palettes[seed % len(palettes)],
+                out,
+                timeout=30,
+            )
+        except Exception as e:
+            if config.CARBON_REMOTE_FALLBACK != str(True):
+                raise UnableToFetchCarbon(str(e))
+            LOGGER(__name__).warning(f"Local carbon render failed: {e}")
+            await self.remote(text, out)
+        if cache:
+            # Keeps the newest CARBON_CACHE_SIZE renders, hits refresh the mtime.
+            trim_files("cache/carbon_[0-9a-f]*.png", config.CARBON_CACHE_SIZE)
+        return out
+
+    async def remote(self, text: str, out: str):
         async with aiohttp.ClientSession(
             headers={"Content-Type": "application/json"},
         ) as ses:
@@ -101,6 +220,12 @@ class CarbonAPI:
             except client_exceptions.ClientConnectorError:
                 raise UnableToFetchCarbon("Can not reach the Host!")
             resp = await request.read()
-            with open(f"cache/carbon{user_id}.jpg", "wb") as f:
-                f.write(resp)
-            return realpath(f.name)
+            part = f"{out}.part"
+            try:
+                with open(part, "wb") as f:
+                    f.write(resp)
+                os.replace(part, out)
+            finally:
+                if os.path.exists(part):
+                    os.remove(part)
+            return out
@@ -1,7 +1,6 @@
 from os import path
 
-from yt_dlp import YoutubeDL
-
+from SONALI_MUSIC.utils import downloader
 from SONALI_MUSIC.utils.formatters import seconds_to_min
 
 
@@ -22,9 +21,8 @@ class SoundAPI:
             return False
 
     async def download(self, url):
-        d = YoutubeDL(self.opts)
         try:
-            info = d.extract_info(url)
+            info = await downloader.download(url, self.opts)
         except:
             return False
         xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
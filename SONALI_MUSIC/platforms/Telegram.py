@@ -15,6 +15,15 @@ from SONALI_MUSIC.utils.formatters import (
 )
 
 
+CHUNK_SIZE = 1024 * 1024
+
+# file path -> shared download task, requests waiting on it and
+# [bytes done, total bytes, start time]
+downloading = {}
+watchers = {}
+transfer = {}
+
+
 class TeleAPI:
     def __init__(self):
         self.chars_limit = 4096
@@ -91,86 +100,126 @@ class TeleAPI:
             file_name = os.path.join(os.path.realpath("downloads"), file_name)
         return file_name
 
+    async def fetch_range(self, message, part: str, fname: str, first: int, count: int):
+        with open(part, "r+b") as f:
+            f.seek(first * CHUNK_SIZE)
+            async for chunk in app.stream_media(message, limit=count, offset=first):
+                f.write(chunk)
+                transfer[fname][0] += len(chunk)
+
+    async def fetch(self, message, fname: str):
+        # Splits the file into ranges fetched side by side, each one holds a
+        # transmission slot of the client.
+        media = getattr(message, message.media.value)
+        size = media.file_size or 0
+        part = f"{fname}.part"
+        transfer[fname] = [0, size, time.time()]
+        try:
+            if not size:
+                await app.download_media(message, file_name=part)
+            else:
+                chunks = -(-size // CHUNK_SIZE)
+                parts = max(
+                    1,
+                    min(config.TG_DOWNLOAD_PARTS, app.max_concurrent_transmissions, chunks // 4),
+                )
+                per = -(-chunks // parts)
+                with open(part, "wb") as f:
+                    f.truncate(size)
+                tasks = [
+                    asyncio.create_task(
+                        self.fetch_range(message, part, fname, first, min(per, chunks - first))
+                    )
+                    for first in range(0, chunks, per)
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+                if transfer[fname][0] < size:
+                    raise ValueError("Incomplete download")
+            os.replace(part, fname)
+        finally:
+            transfer.pop(fname, None)
+            if os.path.exists(part):
+                os.remove(part)
+
+    async def report(self, _, mystic, fname: str):
+        upl = InlineKeyboardMarkup(
+            [
+                [
+                    InlineKeyboardButton(
+                        text="ᴄᴀɴᴄᴇʟ",
+                        callback_data="stop_downloading",
+                    ),
+                ]
+            ]
+        )
+        while not await asyncio.sleep(self.sleep):
+            current, total, start = transfer.get(fname) or (0, 0, 0)
+            if not total or current >= total:
+                continue
+            speed = current / max(time.time() - start, 1)
+            eta = get_readable_time(int((total - current) / speed)) if speed else None
+            try:
+                await mystic.edit_text(
+                    text=_["tg_1"].format(
+                        app.mention,
+                        convert_bytes(total),
+                        convert_bytes(current),
+                        round(current * 100 / total, 2),
+                        convert_bytes(speed),
+                        eta or "0 sᴇᴄᴏɴᴅs",
+                    ),
+                    reply_markup=upl,
+                )
+            except:
+                pass
+
     async def download(self, _, message, mystic, fname):
-        lower = [0, 8, 17, 38, 64, 77, 96]
-        higher = [5, 10, 20, 40, 66, 80, 99]
-        checker = [5, 10, 20, 40, 66, 80, 99]
-        speed_counter = {}
         if os.path.exists(fname):
             return True
 
         async def down_load():
-            async def progress(current, total):
-                if current == total:
-                    return
-                current_time = time.time()
-                start_time = speed_counter.get(message.id)
-                check_time = current_time - start_time
-                upl = InlineKeyboardMarkup(
-                    [
-                        [
-                            InlineKeyboardButton(
-                                text="ᴄᴀɴᴄᴇʟ",
-                                callback_data="stop_downloading",
-                            ),
-                        ]
-                    ]
+            # Everyone playing the same file waits on one download.
+            if fname not in downloading:
+                downloading[fname] = asyncio.create_task(
+                    self.fetch(message.reply_to_message, fname)
                 )
-                percentage = current * 100 / total
-                percentage = str(round(percentage, 2))
-                speed = current / check_time
-                eta = int((total - current) / speed)
-                eta = get_readable_time(eta)
-                if not eta:
-                    eta = "0 sᴇᴄᴏɴᴅs"
-                total_size = convert_bytes(total)
-                completed_size = convert_bytes(current)
-                speed = convert_bytes(speed)
-                percentage = int((percentage.split("."))[0])
-                for counter in range(7):
-                    low = int(lower[counter])
-                    high = int(higher[counter])
-                    check = int(checker[counter])
-                    if low < percentage <= high:
-                        if high == check:
-                            try:
-                                await mystic.edit_text(
-                                    text=_["tg_1"].format(
-                                        app.mention,
-                                        total_size,
-                                        completed_size,
-                                        percentage[:5],
-                                        speed,
-                                        eta,
-                                    ),
-                                    reply_markup=upl,
-                                )
-                                checker[counter] = 100
-                            except:
-                                pass
-
-            speed_counter[message.id] = time.time()
+                downloading[fname].add_done_callback(
+                    lambda _: downloading.pop(fname, None)
+                )
+            task = downloading[fname]
+            watchers[fname] = watchers.get(fname, 0) + 1
+            reporter = asyncio.create_task(self.report(_, mystic, fname))
+            start = time.time()
             try:
-                await app.download_media(
-                    message.reply_to_message,
-                    file_name=fname,
-                    progress=progress,
+                await asyncio.shield(task)
+                await mystic.edit_text(
+                    _["tg_2"].format(get_readable_time(int(time.time() - start)) or "0 sᴇᴄᴏɴᴅs")
                 )
-                try:
-                    elapsed = get_readable_time(
-                        int(int(time.time()) - int(speed_counter[message.id]))
-                    )
-                except:
-                    elapsed = "0 sᴇᴄᴏɴᴅs"
-                await mystic.edit_text(_["tg_2"].format(elapsed))
+                return True
+            except asyncio.CancelledError:
+                raise
             except:
                 await mystic.edit_text(_["tg_3"])
+                return False
+            finally:
+                reporter.cancel()
+                watchers[fname] -= 1
+                if not watchers[fname]:
+                    # Nobody is left waiting, stop a cancelled download.
+                    watchers.pop(fname)
+                    task.cancel()
 
         task = asyncio.create_task(down_load())
         config.lyrical[mystic.id] = task
-        await task
-        verify = config.lyrical.get(mystic.id)
-        if not verify:
+        try:
+            ok = await task
+        except asyncio.CancelledError:
             return False
-        config.lyrical.pop(mystic.id)
-        return True
+        if not config.lyrical.pop(mystic.id, None):
+            return False
+        return ok
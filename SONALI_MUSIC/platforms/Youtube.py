@@ -4,11 +4,13 @@ import re
 from typing import Union, Tuple, List
 
 import aiohttp
-import yt_dlp
 
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
 
+import config
+from SONALI_MUSIC.utils import downloader
+from SONALI_MUSIC.utils.cache import TTLCache
 from SONALI_MUSIC.utils.formatters import time_to_seconds
 from SONALI_MUSIC import LOGGER
 
@@ -22,6 +24,13 @@ except ImportError:
 API_URL = "https://shrutibots.site"
 DOWNLOAD_DIR = "downloads"
 
+# yt-dlp info dicts keyed by video id, shared by /song and formats()
+info_cache = TTLCache(config.YTDL_INFO_CACHE_TTL, maxsize=256)
+# slider search results keyed by (query, user), dropped after inactivity
+slider_cache = TTLCache(config.SLIDER_CACHE_TTL, maxsize=512)
+# HLS manifests of live streams, the signed urls expire after a few hours
+manifest_cache = TTLCache(config.LIVE_MANIFEST_TTL, maxsize=128)
+
 
 # ------------------------------------------------
 # BASIC HELPERS
@@ -297,6 +306,37 @@ class YouTubeAPI:
                 r["id"],
             )
 
+    # ---------------- INFO ----------------
+
+    async def info(self, link: str, videoid=False) -> dict:
+        if videoid:
+            link = self.base + link
+        link = link.split("&")[0]
+
+        vidid = get_video_id(link)
+        info = info_cache.get(vidid)
+        if info is None:
+            info = await downloader.extract_info(link)
+            info_cache.set(vidid, info)
+        return info
+
+    async def manifest(self, link: str, videoid=False) -> Union[str, None]:
+        if videoid:
+            link = self.base + link
+        link = link.split("&")[0]
+
+        vidid = get_video_id(link)
+        url = manifest_cache.get(vidid)
+        if url is None:
+            info = await downloader.extract_info(
+                link, {"format": "best[height<=?720][width<=?1280]"}
+            )
+            url = info.get("url") or info.get("manifest_url")
+            if not url:
+                return None
+            manifest_cache.set(vidid, url)
+        return url
+
     # ---------------- FORMATS ----------------
 
     async def formats(self, link: str, videoid=False):
@@ -304,36 +344,38 @@ class YouTubeAPI:
             link = self.base + link
         link = link.split("&")[0]
 
-        ydl = yt_dlp.YoutubeDL({"quiet": True})
-        with ydl:
-            info = ydl.extract_info(link, download=False)
-            fmts = []
-            for f in info.get("formats", []):
-                try:
-                    if "dash" not in str(f.get("format", "")).lower():
-                        fmts.append(
-                            {
-                                "format": f.get("format"),
-                                "filesize": f.get("filesize"),
-                                "format_id": f.get("format_id"),
-                                "ext": f.get("ext"),
-                                "format_note": f.get("format_note"),
-                                "yturl": link,
-                            }
-                        )
-                except:
-                    continue
+        info = await self.info(link)
+        fmts = []
+        for f in info.get("formats", []):
+            try:
+                if "dash" not in str(f.get("format", "")).lower():
+                    fmts.append(
+                        {
+                            "format": f.get("format"),
+                            "filesize": f.get("filesize"),
+                            "format_id": f.get("format_id"),
+                            "ext": f.get("ext"),
+                            "format_note": f.get("format_note"),
+                            "yturl": link,
+                        }
+                    )
+            except:
+                continue
         return fmts, link
 
     # ---------------- SLIDER ----------------
 
-    async def slider(self, link: str, query_type: int, videoid=False):
+    async def slider(self, link: str, query_type: int, videoid=False, user_id=None):
         if videoid:
             link = self.base + link
         link = link.split("&")[0]
 
-        search = VideosSearch(link, limit=10)
-        res = (await search.next()).get("result")
+        key = (link, user_id)
+        res = slider_cache.get(key)
+        if res is None:
+            search = VideosSearch(link, limit=10)
+            res = (await search.next()).get("result")
+        slider_cache.set(key, res)
         r = res[query_type]
         return (
             r["title"],
@@ -1,3 +1,4 @@
+import glob
 import imghdr
 import os
 from asyncio import gather
@@ -10,20 +11,25 @@ from pyrogram.errors import (
     StickerEmojiInvalid,
     StickerPngDimensions,
     StickerPngNopng,
+    RPCError,
     UserIsBlocked,
 )
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 from SONALI_MUSIC import app
+import config
 from config import BOT_USERNAME
 from SONALI_MUSIC.utils.errors import capture_err
 
 from SONALI_MUSIC.utils.files import (
     get_document_from_file_id,
-    resize_file_to_sticker_size,
+    resize_image,
+    transcode_video,
     upload_document,
 )
+from SONALI_MUSIC.utils.workers import run_in_worker
 
 from SONALI_MUSIC.utils.stickerset import (
+    add_sticker_by_name,
     add_sticker_to_set,
     create_sticker,
     create_sticker_set,
@@ -36,6 +42,55 @@ MAX_STICKERS = (
     120  # would be better if we could fetch this limit directly from telegram
 )
 SUPPORTED_TYPES = ["jpeg", "png", "webp"]
+
+# user_id -> [pack number, stickers in it], so kang skips the pack search
+pack_index = {}
+
+
+def pack_name(packnum: int, user_id: int) -> str:
+    if not packnum:
+        return "f" + str(user_id) + "_by_" + BOT_USERNAME
+    return "f" + str(packnum) + "_" + str(user_id) + "_by_" + BOT_USERNAME
+
+
+def evict_conversions():
+    # Keeps the newest STICKER_CACHE_SIZE conversions, hits refresh the mtime.
+    files = []
+    for path in glob.glob("cache/sticker_*"):
+        try:
+            files.append((os.path.getmtime(path), path))
+        except OSError:
+            pass
+    for _, path in sorted(files)[: max(0, len(files) - config.STICKER_CACHE_SIZE)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def convert_to_sticker(media, video: bool) -> str:
+    # Converted files stay in cache/ by the source's unique id.
+    out = f"cache/sticker_{media.file_unique_id}.{'webm' if video else 'png'}"
+    if os.path.isfile(out):
+        try:
+            os.utime(out)
+            return out
+        except OSError:
+            pass
+    temp_file_path = await app.download_media(media)
+    try:
+        if video:
+            await run_in_worker(transcode_video, temp_file_path, out, timeout=60)
+        else:
+            image_type = imghdr.what(temp_file_path)
+            if image_type not in SUPPORTED_TYPES:
+                raise ValueError("Format not supported! ({})".format(image_type))
+            await run_in_worker(resize_image, temp_file_path, out, timeout=30)
+    finally:
+        if os.path.isfile(temp_file_path):
+            os.remove(temp_file_path)
+    evict_conversions()
+    return out
 # ------------------------------------------
 @app.on_message(filters.command("get_sticker"))
 @capture_err
@@ -85,12 +140,13 @@ async def kang(client, message: Message):
         sticker_emoji = "🤔"
 
     # Get the corresponding fileid, resize the file if necessary
-    doc = message.reply_to_message.photo or message.reply_to_message.document
+    r = message.reply_to_message
+    doc = r.photo or r.document or r.animation or r.video
     try:
-        if message.reply_to_message.sticker:
+        if r.sticker:
             sticker = await create_sticker(
                 await get_document_from_file_id(
-                    message.reply_to_message.sticker.file_id
+                    r.sticker.file_id
                 ),
                 sticker_emoji,
             )
@@ -98,27 +154,24 @@ async def kang(client, message: Message):
             if doc.file_size > 10000000:
                 return await msg.edit("✦ ғɪʟᴇ sɪᴢᴇ ᴛᴏᴏ ʟᴀʀɢᴇ.")
 
-            temp_file_path = await app.download_media(doc)
-            image_type = imghdr.what(temp_file_path)
-            if image_type not in SUPPORTED_TYPES:
-                return await msg.edit(
-                    "Format not supported! ({})".format(image_type)
-                )
+            video = bool(
+                r.animation
+                or r.video
+                or (r.document and (r.document.mime_type or "").startswith("video/"))
+            )
             try:
-                temp_file_path = await resize_file_to_sticker_size(
-                    temp_file_path
-                )
-            except OSError as e:
+                temp_file_path = await convert_to_sticker(doc, video)
+            except ValueError as e:
+                return await msg.edit(str(e))
+            except Exception as e:
                 await msg.edit_text("✦ sᴏᴍᴇᴛʜɪɴɢ ᴡʀᴏɴɢ ʜᴀᴘᴘᴇɴᴇᴅ.")
                 raise Exception(
-                    f"✦ sᴏᴍᴇᴛʜɪɴɢ ᴡᴇɴᴛ ᴡʀᴏɴɢ ᴡʜɪʟᴇ ʀᴇsɪᴢɪɴɢ ᴛʜᴇ sᴛɪᴄᴋᴇʀ (at {temp_file_path}); {e}"
+                    f"✦ sᴏᴍᴇᴛʜɪɴɢ ᴡᴇɴᴛ ᴡʀᴏɴɢ ᴡʜɪʟᴇ ʀᴇsɪᴢɪɴɢ ᴛʜᴇ sᴛɪᴄᴋᴇʀ; {e}"
                 )
             sticker = await create_sticker(
                 await upload_document(client, temp_file_path, message.chat.id),
                 sticker_emoji,
             )
-            if os.path.isfile(temp_file_path):
-                os.remove(temp_file_path)
         else:
             return await msg.edit("✦ ɴᴏᴘᴇ, ᴄᴀɴ'ᴛ  ᴋᴀɴɢ ᴛʜᴀᴛ.")
     except ShortnameOccupyFailed:
@@ -130,43 +183,47 @@ async def kang(client, message: Message):
         e = format_exc()
         return print(e)
 #-------
-    packnum = 0
-    packname = "f" + str(message.from_user.id) + "_by_" + BOT_USERNAME
+    user_id = message.from_user.id
+    packnum = pack_index.get(user_id, [0, 0])[0]
+    packname = pack_name(packnum, user_id)
     limit = 0
     try:
-        while True:
+        # Known pack with room left, add straight away without looking it up.
+        added = None
+        if user_id in pack_index and pack_index[user_id][1] < MAX_STICKERS:
+            try:
+                added = await add_sticker_by_name(client, packname, sticker)
+            except StickerEmojiInvalid:
+                return await msg.edit("[ERROR]: INVALID_EMOJI_IN_ARGUMENT")
+            except RPCError:
+                # Pack deleted or full meanwhile, fall back to the search.
+                added = None
+        while not added:
             # Prevent infinite rules
             if limit >= 50:
                 return await msg.delete()
 
             stickerset = await get_sticker_set_by_name(client, packname)
             if not stickerset:
-                stickerset = await create_sticker_set(
+                added = await create_sticker_set(
                     client,
-                    message.from_user.id,
+                    user_id,
                     f"{message.from_user.first_name[:32]}'s ᴘᴀᴄᴋ ʙʏ @Sonali_Music_bot",
                     packname,
                     [sticker],
                 )
             elif stickerset.set.count >= MAX_STICKERS:
                 packnum += 1
-                packname = (
-                    "f"
-                    + str(packnum)
-                    + "_"
-                    + str(message.from_user.id)
-                    + "_by_"
-                    + BOT_USERNAME
-                )
+                packname = pack_name(packnum, user_id)
                 limit += 1
                 continue
             else:
                 try:
-                    await add_sticker_to_set(client, stickerset, sticker)
+                    added = await add_sticker_to_set(client, stickerset, sticker)
                 except StickerEmojiInvalid:
                     return await msg.edit("[ERROR]: INVALID_EMOJI_IN_ARGUMENT")
             limit += 1
-            break
+        pack_index[user_id] = [packnum, added.set.count]
 
         await msg.edit(
             "✦ sᴛɪᴄᴋᴇʀ ᴋᴀɴɢᴇᴅ ᴛᴏ [ᴘᴀᴄᴋ](t.me/addstickers/{})\n✦ ᴇᴍᴏᴊɪ: {}".format(
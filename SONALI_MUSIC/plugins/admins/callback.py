@@ -1,7 +1,10 @@
 import asyncio
+import time
+
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, CallbackQuery
 
+import config
 from SONALI_MUSIC import YouTube, app
 from SONALI_MUSIC.core.call import Sona
 from SONALI_MUSIC.misc import SUDOERS, db
@@ -18,6 +21,7 @@ from SONALI_MUSIC.utils.database import (
 )
 from pyrogram.errors import (
     ChatAdminRequired,
+    FloodWait,
     InviteRequestSent,
     UserAlreadyParticipant,
     UserNotParticipant,
@@ -25,8 +29,14 @@ from pyrogram.errors import (
 from SONALI_MUSIC.utils.database import get_assistant
 from SONALI_MUSIC.utils.decorators.language import languageCB
 from SONALI_MUSIC.utils.formatters import seconds_to_min
-from SONALI_MUSIC.utils.inline import close_markup, stream_markup, stream_markup_timer
+from SONALI_MUSIC.utils.inline import (
+    close_markup,
+    stream_markup,
+    stream_markup_timer,
+    timer_bar,
+)
 from SONALI_MUSIC.utils.stream.autoclear import auto_clean
+from SONALI_MUSIC.utils.stream.relay import live_url
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 from config import (
     BANNED_USERS,
@@ -42,6 +52,11 @@ from strings import get_string
 
 checker = {}
 upvoters = {}
+timer_backoff = {}
+timer_editing = set()
+timer_sent = {}
+# The label also shows the elapsed time, refresh it even when the bar has not moved.
+TIMER_REFRESH = 28
 
 
 
@@ -181,7 +196,7 @@ async def del_back_playlist(client, CallbackQuery, _):
             txt = f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
             popped = None
             try:
-                popped = check.pop(0)
+                popped = check.popleft()
                 if popped:
                     await auto_clean(popped)
                 if not check:
@@ -230,8 +245,8 @@ async def del_back_playlist(client, CallbackQuery, _):
             db[chat_id][0]["speed_path"] = None
             db[chat_id][0]["speed"] = 1.0
         if "live_" in queued:
-            n, link = await YouTube.video(videoid, True)
-            if n == 0:
+            link = await live_url(videoid)
+            if not link:
                 return await CallbackQuery.message.reply_text(
                     text=_["admin_7"].format(title),
                     reply_markup=close_markup(_),
@@ -256,7 +271,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
         elif "vid_" in queued:
@@ -292,7 +307,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
             await mystic.delete()
@@ -307,7 +322,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 caption=_["stream_2"].format(user),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
         else:
@@ -335,7 +350,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "tg"
             elif videoid == "soundcloud":
                 button = stream_markup(_, chat_id)
@@ -348,7 +363,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "tg"
             else:
                 button = stream_markup(_, chat_id)
@@ -363,16 +378,40 @@ async def del_back_playlist(client, CallbackQuery, _):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
 
 
+async def edit_timer(chat_id, original_chat_id, mystic, buttons, bar, delay):
+    await asyncio.sleep(delay)
+    try:
+        await app.edit_message_reply_markup(
+            original_chat_id, mystic, reply_markup=InlineKeyboardMarkup(buttons)
+        )
+        timer_sent[chat_id] = (mystic, bar, time.time())
+    except FloodWait as e:
+        timer_backoff[chat_id] = time.time() + e.value
+    except:
+        pass
+    finally:
+        timer_editing.discard(chat_id)
+
+
 async def markup_timer():
     while not await asyncio.sleep(7):
+        due = []
         active_chats = await get_active_chats()
+        for stale in [c for c in timer_sent if c not in active_chats]:
+            timer_sent.pop(stale, None)
+        for stale in [c for c in timer_backoff if c not in active_chats]:
+            timer_backoff.pop(stale, None)
         for chat_id in active_chats:
             try:
+                if chat_id in timer_editing:
+                    continue
+                if timer_backoff.get(chat_id, 0) > time.time():
+                    continue
                 if not await is_music_playing(chat_id):
                     continue
                 playing = db.get(chat_id)
@@ -381,35 +420,43 @@ async def markup_timer():
                 duration_seconds = int(playing[0]["seconds"])
                 if duration_seconds == 0:
                     continue
-                try:
-                    mystic = playing[0]["mystic"]
-                except:
+                mystic = playing[0]["mystic"]
+                if not mystic:
                     continue
                 try:
-                    check = checker[chat_id][mystic.id]
+                    check = checker[chat_id][mystic]
                     if check is False:
                         continue
                 except:
                     pass
+                played = seconds_to_min(playing[0]["played"])
+                bar = timer_bar(played, playing[0]["dur"])
+                sent = timer_sent.get(chat_id)
+                if (
+                    sent
+                    and sent[:2] == (mystic, bar)
+                    and time.time() - sent[2] < TIMER_REFRESH
+                ):
+                    continue
                 try:
                     language = await get_lang(chat_id)
                     _ = get_string(language)
                 except:
                     _ = get_string("en")
-                try:
-                    buttons = stream_markup_timer(
-                        _,
-                        chat_id,
-                        seconds_to_min(playing[0]["played"]),
-                        playing[0]["dur"],
-                    )
-                    await mystic.edit_reply_markup(
-                        reply_markup=InlineKeyboardMarkup(buttons)
-                    )
-                except:
-                    continue
+                buttons = stream_markup_timer(_, chat_id, played, playing[0]["dur"])
+                due.append((chat_id, playing[0]["chat_id"], mystic, buttons, bar))
             except:
                 continue
+        # Spread this round over the interval within the global edit budget,
+        # longest-waiting chats first so what does not fit goes next round.
+        budget = int(7 * config.TIMER_EDITS_PER_SECOND)
+        if not due or budget < 1:
+            continue
+        due.sort(key=lambda job: timer_sent.get(job[0], (None, None, 0))[2])
+        step = 7 / min(len(due), budget)
+        for i, job in enumerate(due[:budget]):
+            timer_editing.add(job[0])
+            asyncio.create_task(edit_timer(*job, i * step))
 
 
 asyncio.create_task(markup_timer())
@@ -3,6 +3,7 @@ from pyrogram.enums import ChatType, ChatMemberStatus
 from SONALI_MUSIC import app
 from pyrogram import filters
 from SONALI_MUSIC.utils.Sona_BAN import admin_filter
+from SONALI_MUSIC.utils.roster import iter_members
 
 
 
@@ -19,12 +20,12 @@ async def tag_all_users(_,message):
         SPAM_CHATS.append(message.chat.id)      
         usernum= 0
         usertxt = ""
-        async for m in app.get_chat_members(message.chat.id): 
+        async for user_id, first_name, _ in iter_members(message.chat.id): 
             if message.chat.id not in SPAM_CHATS:
                 break       
-            usernum += 5
-            usertxt += f"\n⊚ [{m.user.first_name}](tg://user?id={m.user.id})\n"
-            if usernum == 1:
+            usernum += 1
+            usertxt += f"\n⊚ [{first_name}](tg://user?id={user_id})\n"
+            if usernum == 5:
                 await replied.reply_text(usertxt)
                 await asyncio.sleep(2)
                 usernum = 0
@@ -39,11 +40,11 @@ async def tag_all_users(_,message):
         SPAM_CHATS.append(message.chat.id)
         usernum= 0
         usertxt = ""
-        async for m in app.get_chat_members(message.chat.id):       
+        async for user_id, first_name, _ in iter_members(message.chat.id):       
             if message.chat.id not in SPAM_CHATS:
                 break 
             usernum += 1
-            usertxt += f"\n⊚ [{m.user.first_name}](tg://user?id={m.user.id})\n"
+            usertxt += f"\n⊚ [{first_name}](tg://user?id={user_id})\n"
             if usernum == 5:
                 await app.send_message(message.chat.id,f'{text}\n{usertxt}\n\n|| ➥ ᴏғғ ᴛᴀɢɢɪɴɢ ʙʏ » /alloff ||')
                 await asyncio.sleep(2)
@@ -62,6 +62,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
             seconds_to_min(to_seek),
             duration,
             playing[0]["streamtype"],
+            speed=None if check else playing[0].get("speed"),
         )
     except:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
@@ -9,6 +9,7 @@ from SONALI_MUSIC.utils.database import get_loop
 from SONALI_MUSIC.utils.decorators import AdminRightsCheck
 from SONALI_MUSIC.utils.inline import close_markup, stream_markup
 from SONALI_MUSIC.utils.stream.autoclear import auto_clean
+from SONALI_MUSIC.utils.stream.relay import live_url
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 from config import BANNED_USERS
 
@@ -31,27 +32,21 @@ async def skip(cli, message: Message, _, chat_id):
                 if count > 2:
                     count = int(count - 1)
                     if 1 <= state <= count:
-                        for x in range(state):
-                            popped = None
+                        for popped in check.skip(state):
+                            await auto_clean(popped)
+                        if not check:
                             try:
-                                popped = check.pop(0)
+                                await message.reply_text(
+                                    text=_["admin_6"].format(
+                                        message.from_user.mention,
+                                        message.chat.title,
+                                    ),
+                                    reply_markup=close_markup(_),
+                                )
+                                await Sona.stop_stream(chat_id)
                             except:
-                                return await message.reply_text(_["admin_12"])
-                            if popped:
-                                await auto_clean(popped)
-                            if not check:
-                                try:
-                                    await message.reply_text(
-                                        text=_["admin_6"].format(
-                                            message.from_user.mention,
-                                            message.chat.title,
-                                        ),
-                                        reply_markup=close_markup(_),
-                                    )
-                                    await Sona.stop_stream(chat_id)
-                                except:
-                                    return
-                                break
+                                pass
+                            return
                     else:
                         return await message.reply_text(_["admin_11"].format(count))
                 else:
@@ -64,7 +59,7 @@ async def skip(cli, message: Message, _, chat_id):
         check = db.get(chat_id)
         popped = None
         try:
-            popped = check.pop(0)
+            popped = check.popleft()
             if popped:
                 await auto_clean(popped)
             if not check:
@@ -103,8 +98,8 @@ async def skip(cli, message: Message, _, chat_id):
         db[chat_id][0]["speed_path"] = None
         db[chat_id][0]["speed"] = 1.0
     if "live_" in queued:
-        n, link = await YouTube.video(videoid, True)
-        if n == 0:
+        link = await live_url(videoid)
+        if not link:
             return await message.reply_text(_["admin_7"].format(title))
         try:
             image = await YouTube.thumbnail(videoid, True)
@@ -126,7 +121,7 @@ async def skip(cli, message: Message, _, chat_id):
             ),
             reply_markup=InlineKeyboardMarkup(button),
         )
-        db[chat_id][0]["mystic"] = run
+        db[chat_id][0]["mystic"] = run.id
         db[chat_id][0]["markup"] = "tg"
     elif "vid_" in queued:
         mystic = await message.reply_text(_["call_7"], disable_web_page_preview=True)
@@ -160,7 +155,7 @@ async def skip(cli, message: Message, _, chat_id):
             ),
             reply_markup=InlineKeyboardMarkup(button),
         )
-        db[chat_id][0]["mystic"] = run
+        db[chat_id][0]["mystic"] = run.id
         db[chat_id][0]["markup"] = "stream"
         await mystic.delete()
     elif "index_" in queued:
@@ -175,7 +170,7 @@ async def skip(cli, message: Message, _, chat_id):
             caption=_["stream_2"].format(user),
             reply_markup=InlineKeyboardMarkup(button),
         )
-        db[chat_id][0]["mystic"] = run
+        db[chat_id][0]["mystic"] = run.id
         db[chat_id][0]["markup"] = "tg"
     else:
         if videoid == "telegram":
@@ -203,7 +198,7 @@ async def skip(cli, message: Message, _, chat_id):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
         elif videoid == "soundcloud":
             button = stream_markup(_, chat_id)
@@ -217,7 +212,7 @@ async def skip(cli, message: Message, _, chat_id):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
         else:
             button = stream_markup(_, chat_id)
@@ -233,5 +228,5 @@ async def skip(cli, message: Message, _, chat_id):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "stream"
@@ -3,29 +3,22 @@ import os
 import csv
 from pyrogram import Client, filters
 from SONALI_MUSIC import app
+from SONALI_MUSIC.utils.roster import iter_members
 
 @app.on_message(filters.command("user") & admin_filter)
-def user_command(client, message):
-    
-    chat_members = app.get_chat_members(message.chat.id)
-
-    
-    members_list = []
-    for member in chat_members:
-        members_list.append({
-            "username": member.user.username,
-            "userid": member.user.id
-        })
-
-    
-    with open("members.txt", "w", newline="") as file:
+async def user_command(client, message):
+    path = f"members_{message.chat.id}.txt"
+    with open(path, "w", newline="") as file:
         writer = csv.DictWriter(file, fieldnames=["username", "userid"])
         writer.writeheader()
-        for member in members_list:
-            writer.writerow(member)
+        async for user_id, _, username in iter_members(message.chat.id):
+            writer.writerow({"username": username, "userid": user_id})
 
     # Send the text file as a reply to the message
-    app.send_document(message.chat.id, "members.txt")
+    try:
+        await app.send_document(message.chat.id, path, file_name="members.txt")
+    finally:
+        os.remove(path)
 
 
 # Command handler for /givelink command
@@ -11,6 +11,7 @@ from SONALI_MUSIC.misc import _boot_
 from SONALI_MUSIC.plugins.sudo.sudoers import sudoers_list
 from SONALI_MUSIC.utils.database import get_served_chats, get_served_users, get_sudoers
 from SONALI_MUSIC.utils import bot_sys_stats
+from SONALI_MUSIC.utils.chatcache import remember_chat
 from SONALI_MUSIC.utils.database import (
     add_served_chat,
     add_served_user,
@@ -169,6 +170,7 @@ async def welcome(client, message: Message):
                     )
                     return await app.leave_chat(message.chat.id)
  
+                remember_chat(message.chat)
                 out = start_panel(_)
                 await message.reply_photo(
                     random.choice(NEXIO),
@@ -1,79 +1,64 @@
 import asyncio
-from datetime import datetime
 
 from pyrogram.enums import ChatType
+from pyrogram.errors import FloodWait
 
 import config
-from SONALI_MUSIC import app
-from SONALI_MUSIC.core.call import Sona, autoend
-from SONALI_MUSIC.utils.database import get_client, is_active_chat, is_autoend
+from SONALI_MUSIC.utils.database import (
+    add_membership,
+    get_client,
+    get_stale_memberships,
+    has_memberships,
+    is_active_chat,
+    remove_membership,
+    touch_membership,
+)
+from SONALI_MUSIC.utils.scheduler import scheduler
 
 
-async def auto_leave():
-    if config.AUTO_LEAVING_ASSISTANT == str(True):
-        while not await asyncio.sleep(
-            config.AUTO_LEAVE_ASSISTANT_TIME
-        ):
-            from SONALI_MUSIC.core.userbot import assistants
+# Leaves per assistant and cycle, spaced apart so GetDialogs/LeaveChannel stay quiet.
+LEAVE_LIMIT = 20
+LEAVE_GAP = 10
+
+keep = (config.LOGGER_ID, -1001919135283, -1001841879487)
 
-            for num in assistants:
-                client = await get_client(num)
-                left = 0
-                try:
-                    async for i in client.iter_dialogs():
-                        chat_type = i.chat.type
-                        if chat_type in [
-                            "supergroup",
-                            "group",
-                            "channel",
-                        ]:
-                            chat_id = i.chat.id
-                            if (
-                                chat_id != config.LOGGER_ID
-                                and i.chat.id != -1001919135283
-                                and i.chat.id != -1001841879487
-                            ):
-                                if left == 20:
-                                    continue
-                                if not await is_active_chat(chat_id):
-                                    try:
-                                        await client.leave_chat(
-                                            chat_id
-                                        )
-                                        left += 1
-                                    except:
-                                        continue
-                except:
-                    pass
 
+async def seed_memberships(client):
+    # One walk over the dialogs for chats joined before the index existed.
+    async for dialog in client.get_dialogs():
+        if dialog.chat.type in (ChatType.GROUP, ChatType.SUPERGROUP, ChatType.CHANNEL):
+            await add_membership(client.id, dialog.chat.id)
 
-asyncio.create_task(auto_leave())
 
+async def auto_leave():
+    from SONALI_MUSIC.core.userbot import assistants
 
-async def auto_end():
-    while not await asyncio.sleep(5):
-        if not await is_autoend():
+    scheduler.schedule("autoleave", config.AUTO_LEAVE_ASSISTANT_TIME, auto_leave)
+    for num in assistants:
+        client = await get_client(num)
+        try:
+            if not await has_memberships(client.id):
+                await seed_memberships(client)
+            stale = await get_stale_memberships(
+                client.id, config.AUTO_LEAVE_ASSISTANT_TIME, LEAVE_LIMIT, keep
+            )
+        except:
             continue
-        for chat_id in autoend:
-            timer = autoend.get(chat_id)
-            if not timer:
+        for chat_id in stale:
+            if await is_active_chat(chat_id):
+                # Still streaming, move it to the back instead of holding a slot.
+                await touch_membership(chat_id)
                 continue
-            if datetime.now() > timer:
-                if not await is_active_chat(chat_id):
-                    autoend[chat_id] = {}
-                    continue
-                autoend[chat_id] = {}
-                try:
-                    await Sona.stop_stream(chat_id)
-                except:
-                    continue
-                try:
-                    await app.send_message(
-                        chat_id,
-                        "» ʙᴏᴛ ᴀᴜᴛᴏᴍᴀᴛɪᴄᴀʟʟʏ ʟᴇғᴛ ᴠɪᴅᴇᴏᴄʜᴀᴛ ʙᴇᴄᴀᴜsᴇ ɴᴏ ᴏɴᴇ ᴡᴀs ʟɪsᴛᴇɴɪɴɢ ᴏɴ ᴠɪᴅᴇᴏᴄʜᴀᴛ.",
-                    )
-                except:
-                    continue
+            try:
+                await client.leave_chat(chat_id)
+            except FloodWait as e:
+                await asyncio.sleep(e.value)
+                break
+            except:
+                pass
+            await remove_membership(client.id, chat_id)
+            await asyncio.sleep(LEAVE_GAP)
 
 
-asyncio.create_task(auto_end())
+if config.AUTO_LEAVING_ASSISTANT == str(True):
+    scheduler.schedule("autoleave", config.AUTO_LEAVE_ASSISTANT_TIME, auto_leave)
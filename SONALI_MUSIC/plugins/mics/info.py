@@ -1,6 +1,6 @@
 import asyncio, os, time, aiohttp
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageFont
 from asyncio import sleep
 from SONALI_MUSIC import app
 from pyrogram import filters, Client, enums
@@ -14,6 +14,11 @@ from pyrogram.types import (
 )
 from typing import Union, Optional
 
+import config
+from SONALI_MUSIC.utils.cache import TTLCache
+from SONALI_MUSIC.utils.thumbnails import render_userinfo
+from SONALI_MUSIC.utils.workers import run_in_worker
+
 EVAA = [
     [
         InlineKeyboardButton(
@@ -43,34 +48,15 @@ async def get_userinfo_img(
     user_id: Union[int, str],
     profile_path: Optional[str] = None,
 ):
-    bg = Image.open(bg_path)
-
-    if profile_path:
-        img = Image.open(profile_path)
-
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-
-        draw.pieslice([(0, 0), img.size], 0, 360, fill=255)
-
-        circular_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        circular_img.paste(img, (0, 0), mask)
-
-        resized = circular_img.resize((534, 534))
-
-        bg.paste(resized, (607, 86), resized)
-
-    img_draw = ImageDraw.Draw(bg)
-
     path = f"./userinfo_img_{user_id}.png"
-
-    bg.save(path)
-
-    return path
+    return await run_in_worker(render_userinfo, bg_path, profile_path, path, timeout=30)
 
 
 # --------------------------------------------------------------------------------- #
 
+# (user_id, photo unique id, name hash) -> file_id of the sent card
+info_cards = TTLCache(config.INFO_CARD_CACHE_TTL, maxsize=2048)
+
 bg_path = "SONALI_MUSIC/assets/SonaINFO.png"
 font_path = "SONALI_MUSIC/assets/hiroko.ttf"
 
@@ -94,9 +80,9 @@ INFO_TEXT = """
 # --------------------------------------------------------------------------------- #
 
 
-async def userstatus(user_id):
+async def userstatus(user_id, user=None):
     try:
-        user = await app.get_users(user_id)
+        user = user or await app.get_users(user_id)
 
         x = user.status
 
@@ -140,13 +126,40 @@ async def userinfo(_, message):
         user_info = await app.get_chat(target_user_id)
         user = await app.get_users(target_user_id)
 
-        status = await userstatus(user.id)
+        status = await userstatus(user.id, user)
 
         id = user_info.id
         dc_id = user.dc_id
         username = user_info.username or "None"
         mention = user.mention
         bio = user_info.bio or "No Bio"
+        caption = INFO_TEXT.format(
+            id,
+            username,
+            mention,
+            status,
+            dc_id,
+            bio,
+        )
+
+        # The card only changes with the photo or name, reuse the uploaded one.
+        key = (
+            user.id,
+            user.photo.big_photo_unique_id if user.photo else None,
+            hash((user.first_name, user.last_name)),
+        )
+        file_id = info_cards.get(key)
+        if file_id:
+            try:
+                return await app.send_photo(
+                    chat_id,
+                    photo=file_id,
+                    caption=caption,
+                    reply_to_message_id=message.id,
+                    reply_markup=InlineKeyboardMarkup(EVAA),
+                )
+            except Exception:
+                info_cards.pop(key)
 
         photo = None
 
@@ -155,33 +168,28 @@ async def userinfo(_, message):
                 user.photo.big_file_id
             )
 
-        welcome_photo = await get_userinfo_img(
-            bg_path=bg_path,
-            font_path=font_path,
-            user_id=target_user_id,
-            profile_path=photo,
-        )
-
-        await app.send_photo(
-            chat_id,
-            photo=welcome_photo,
-            caption=INFO_TEXT.format(
-                id,
-                username,
-                mention,
-                status,
-                dc_id,
-                bio,
-            ),
-            reply_to_message_id=message.id,
-            reply_markup=InlineKeyboardMarkup(EVAA),
-        )
+        try:
+            welcome_photo = await get_userinfo_img(
+                bg_path=bg_path,
+                font_path=font_path,
+                user_id=target_user_id,
+                profile_path=photo,
+            )
 
-        if photo and os.path.exists(photo):
-            os.remove(photo)
+            sent = await app.send_photo(
+                chat_id,
+                photo=welcome_photo,
+                caption=caption,
+                reply_to_message_id=message.id,
+                reply_markup=InlineKeyboardMarkup(EVAA),
+            )
+            info_cards.set(key, sent.photo.file_id)
+        finally:
+            if photo and os.path.exists(photo):
+                os.remove(photo)
 
-        if os.path.exists(welcome_photo):
-            os.remove(welcome_photo)
+            if os.path.exists(f"./userinfo_img_{target_user_id}.png"):
+                os.remove(f"./userinfo_img_{target_user_id}.png")
 
     # ------------------------------------------------ #
 
@@ -1,6 +1,28 @@
+import asyncio
+import hashlib
+from io import BytesIO
+
 from pyrogram import Client, filters
-from gtts import gTTS
+
+import config
 from SONALI_MUSIC import app
+from SONALI_MUSIC.utils.cache import TTLCache
+from SONALI_MUSIC.utils.speech import synthesize
+from SONALI_MUSIC.utils.workers import run_in_worker
+
+# sha1 of (lang, text) -> file_id of the audio already sent once
+tts_cache = TTLCache(config.TTS_CACHE_TTL, maxsize=config.TTS_CACHE_SIZE)
+synthesizing = {}
+
+
+async def get_speech(key: str, text: str, lang: str) -> bytes:
+    # Identical requests arriving together share one synthesis.
+    if key not in synthesizing:
+        synthesizing[key] = asyncio.ensure_future(
+            run_in_worker(synthesize, text, lang, timeout=60)
+        )
+        synthesizing[key].add_done_callback(lambda _: synthesizing.pop(key, None))
+    return await asyncio.shield(synthesizing[key])
 
 
 @app.on_message(filters.command('tts'))
@@ -16,15 +38,23 @@ async def text_to_speech(client, message):
         # Extract text for TTS
         text = message.text.split(' ', 1)[1]
 
+        key = hashlib.sha1(f"hi:{text}".encode()).hexdigest()
+        file_id = tts_cache.get(key)
+        if file_id:
+            try:
+                return await app.send_audio(chat_id=message.chat.id, audio=file_id)
+            except Exception:
+                tts_cache.pop(key)
+
         # Generate the TTS audio
-        tts = gTTS(text=text, lang='hi')
-        file_name = "speech.mp3"
-        tts.save(file_name)
+        audio = BytesIO(await get_speech(key, text, "hi"))
+        audio.name = "speech.mp3"
 
         # Send the generated audio file
-        await app.send_audio(chat_id=message.chat.id, audio=file_name)
+        sent = await app.send_audio(chat_id=message.chat.id, audio=audio)
+        tts_cache.set(key, sent.audio.file_id)
 
     except Exception as e:
         # Handle errors gracefully
-        await message.repl
+        await message.reply_text(str(e))
         
@@ -1,14 +1,59 @@
 from pyrogram import filters
-from pyrogram.types import Message
+from pyrogram.enums import ChatMemberStatus
+from pyrogram.types import ChatMemberUpdated, Message
 
 from SONALI_MUSIC import app
 from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.userbot import assistantids
+from SONALI_MUSIC.utils.database import add_membership, remove_membership
+from SONALI_MUSIC.utils.roster import add_member, drop_roster, remove_member
 
 welcome = 20
 close = 30
+roster = -3
 
 
 @app.on_message(filters.video_chat_started, group=welcome)
 @app.on_message(filters.video_chat_ended, group=close)
 async def welcome(_, message: Message):
     await Sona.stop_stream_force(message.chat.id)
+
+
+@app.on_message(filters.new_chat_members, group=roster)
+async def roster_join(_, message: Message):
+    for member in message.new_chat_members:
+        add_member(message.chat.id, member)
+        if member.id in assistantids:
+            await add_membership(member.id, message.chat.id)
+
+
+@app.on_message(filters.left_chat_member, group=roster)
+async def roster_leave(_, message: Message):
+    if message.left_chat_member.id == app.id:
+        return drop_roster(message.chat.id)
+    if message.left_chat_member.id in assistantids:
+        await remove_membership(message.left_chat_member.id, message.chat.id)
+    remove_member(message.chat.id, message.left_chat_member.id)
+
+
+@app.on_chat_member_updated(group=roster)
+async def roster_update(_, update: ChatMemberUpdated):
+    member = update.new_chat_member or update.old_chat_member
+    if not member or not member.user:
+        return
+    if update.new_chat_member and update.new_chat_member.status not in (
+        ChatMemberStatus.LEFT,
+        ChatMemberStatus.BANNED,
+    ):
+        add_member(update.chat.id, member.user)
+        old = update.old_chat_member
+        if member.user.id in assistantids and (
+            not old or old.status in (ChatMemberStatus.LEFT, ChatMemberStatus.BANNED)
+        ):
+            await add_membership(member.user.id, update.chat.id)
+    elif member.user.id == app.id:
+        drop_roster(update.chat.id)
+    else:
+        remove_member(update.chat.id, member.user.id)
+        if member.user.id in assistantids:
+            await remove_membership(member.user.id, update.chat.id)
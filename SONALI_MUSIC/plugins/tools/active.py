@@ -4,19 +4,15 @@ from unidecode import unidecode
 
 from SONALI_MUSIC import app
 from SONALI_MUSIC.misc import SUDOERS
+from SONALI_MUSIC.utils.chatcache import get_chat_meta, get_invite_link
 from SONALI_MUSIC.utils.database import (
-    get_active_chats,
-    get_active_video_chats,
+    get_all_active_chats,
+    get_all_active_video_chats,
     remove_active_chat,
     remove_active_video_chat,
 )
 
 
-async def generate_join_link(chat_id: int):
-    invite_link = await app.export_chat_invite_link(chat_id)
-    return invite_link
-
-
 def ordinal(n):
     suffix = ["th", "st", "nd", "rd", "th"][min(n % 10, 4)]
     if 11 <= (n % 100) <= 13:
@@ -32,21 +28,21 @@ def ordinal(n):
 )
 async def activevc(_, message: Message):
     mystic = await message.reply_text("» ɢᴇᴛᴛɪɴɢ ᴀᴄᴛɪᴠᴇ ᴠᴏɪᴄᴇ ᴄʜᴀᴛs ʟɪsᴛ...")
-    served_chats = await get_active_chats()
+    served_chats = await get_all_active_chats()
     text = ""
     j = 0
     buttons = []
     for x in served_chats:
         try:
-            chat_info = await app.get_chat(x)
-            title = chat_info.title
-            invite_link = await generate_join_link(x)
+            chat_info = await get_chat_meta(x)
+            title = chat_info["title"]
+            invite_link = await get_invite_link(x)
         except:
             await remove_active_chat(x)
             continue
         try:
-            if chat_info.username:
-                user = chat_info.username
+            if chat_info["username"]:
+                user = chat_info["username"]
                 text += f"<b>{j + 1}.</b> <a href=https://t.me/{user}>{unidecode(title).upper()}</a> [<code>{x}</code>]\n"
             else:
                 text += (
@@ -75,21 +71,21 @@ async def activevc(_, message: Message):
 )
 async def activevi_(_, message: Message):
     mystic = await message.reply_text("» ɢᴇᴛᴛɪɴɢ ᴀᴄᴛɪᴠᴇ ᴠɪᴅᴇᴏ ᴄʜᴀᴛs ʟɪsᴛ...")
-    served_chats = await get_active_video_chats()
+    served_chats = await get_all_active_video_chats()
     text = ""
     j = 0
     buttons = []
     for x in served_chats:
         try:
-            chat_info = await app.get_chat(x)
-            title = chat_info.title
-            invite_link = await generate_join_link(x)
+            chat_info = await get_chat_meta(x)
+            title = chat_info["title"]
+            invite_link = await get_invite_link(x)
         except:
             await remove_active_video_chat(x)
             continue
         try:
-            if chat_info.username:
-                user = chat_info.username
+            if chat_info["username"]:
+                user = chat_info["username"]
                 text += f"<b>{j + 1}.</b> <a href=https://t.me/{user}>{unidecode(title).upper()}</a> [<code>{x}</code>]\n"
             else:
                 text += (
@@ -112,8 +108,8 @@ async def activevi_(_, message: Message):
 
 @app.on_message(filters.command(["ac"]) & SUDOERS)
 async def start(client: Client, message: Message):
-    ac_audio = str(len(await get_active_chats()))
-    ac_video = str(len(await get_active_video_chats()))
+    ac_audio = str(len(await get_all_active_chats()))
+    ac_video = str(len(await get_all_active_video_chats()))
     await message.reply_text(
         f"✫ <b><u>ᴀᴄᴛɪᴠᴇ ᴄʜᴀᴛs ɪɴғᴏ</u></b> :\n\nᴠᴏɪᴄᴇ : {ac_audio}\nᴠɪᴅᴇᴏ  : {ac_video}",
         reply_markup=InlineKeyboardMarkup(
@@ -1,15 +1,29 @@
+import asyncio
+import time
+
 from pyrogram import filters
 from pyrogram.enums import ChatMembersFilter
+from pyrogram.errors import FloodWait
 from pyrogram.types import ChatJoinRequest
 from pyrogram.errors.exceptions.bad_request_400 import UserAlreadyParticipant
+import config
 from SONALI_MUSIC import app
 from SONALI_MUSIC.core.mongo import mongodb
+from SONALI_MUSIC.logging import LOGGER
 from SONALI_MUSIC.misc import SUDOERS
+from SONALI_MUSIC.utils.cache import TTLCache
 from SONALI_MUSIC.utils.keyboard import ikb
 from SONALI_MUSIC.utils.permissions import adminsOnly, member_permissions
 
 approvaldb = mongodb.autoapprove
 
+# chat_id -> "automatic", "manual" or None when autoapprove is off
+approval_modes = {}
+# chat_id -> {user_id: user} of join requests waiting for the drain task
+join_queue = {}
+draining = {}
+admin_tags = TTLCache(config.CHAT_CACHE_TTL, maxsize=1024)
+
 
 def smallcap(text):
     trans_table = str.maketrans(
@@ -19,6 +33,13 @@ def smallcap(text):
     return text.translate(trans_table)
 
 
+async def get_mode(chat_id: int):
+    if chat_id not in approval_modes:
+        chat = await approvaldb.find_one({"chat_id": chat_id})
+        approval_modes[chat_id] = chat.get("mode") if chat else None
+    return approval_modes[chat_id]
+
+
 @app.on_message(filters.command("autoapprove") & filters.group)
 @adminsOnly("can_change_info")
 async def approval_command(client, message):
@@ -33,6 +54,7 @@ async def approval_command(client, message):
                 {"$set": {"mode": mode}},
                 upsert=True,
             )
+        approval_modes[chat_id] = mode
         if mode == "automatic":
             switch = "manual"
             mdbutton = "ᴀᴜᴛᴏᴍᴀᴛɪᴄ"
@@ -71,7 +93,8 @@ async def approval_cb(client, cb):
     option = command_parts[1]
     if option == "off":
         if await approvaldb.count_documents({"chat_id": chat_id}) > 0:
-            approvaldb.delete_one({"chat_id": chat_id})
+            await approvaldb.delete_one({"chat_id": chat_id})
+            approval_modes[chat_id] = None
             buttons = {"ᴛᴜʀɴ ᴏɴ": "approval_on"}
             keyboard = ikb(buttons, 1)
             return await cb.edit_message_text(
@@ -92,8 +115,8 @@ async def approval_cb(client, cb):
         {"$set": {"mode": mode}},
         upsert=True,
     )
-    chat = await approvaldb.find_one({"chat_id": chat_id})
-    mode = smallcap(chat["mode"])
+    approval_modes[chat_id] = mode
+    mode = smallcap(mode)
     buttons = {"ᴛᴜʀɴ ᴏғғ": "approval_off", f"{mode}": f"approval_{switch}"}
     keyboard = ikb(buttons, 1)
     await cb.edit_message_text(
@@ -115,53 +138,105 @@ async def clear_pending_command(client, message):
         await message.reply_text("No pending users to clear.")
 
 
-@app.on_chat_join_request(filters.group)
-async def accept(client, message: ChatJoinRequest):
-    chat = message.chat
-    user = message.from_user
-    chat_id = await approvaldb.find_one({"chat_id": chat.id})
-    if chat_id:
-        mode = chat_id["mode"]
-        if mode == "automatic":
-            await app.approve_chat_join_request(chat_id=chat.id, user_id=user.id)
+async def approve(chat_id: int, user_id: int):
+    while True:
+        try:
+            return await app.approve_chat_join_request(chat_id=chat_id, user_id=user_id)
+        except FloodWait as e:
+            await asyncio.sleep(e.value)
+        except Exception:
+            # Withdrawn or already handled by an admin.
             return
-        if mode == "manual":
-            is_user_in_pending = await approvaldb.count_documents(
-                {"chat_id": chat.id, "pending_users": int(user.id)}
+
+
+async def approve_batch(chat_id: int, user_ids: list):
+    for i in range(0, len(user_ids), config.APPROVE_RATE):
+        start = time.monotonic()
+        await asyncio.gather(
+            *(approve(chat_id, user_id) for user_id in user_ids[i : i + config.APPROVE_RATE])
+        )
+        await asyncio.sleep(max(0, 1 - (time.monotonic() - start)))
+
+
+async def get_admin_tags(chat_id: int) -> str:
+    tags = admin_tags.get(chat_id)
+    if tags is None:
+        tags = "".join(
+            f"[\u2063](tg://user?id={admin.user.id})"
+            async for admin in app.get_chat_members(
+                chat_id=chat_id,
+                filter=ChatMembersFilter.ADMINISTRATORS,
             )
-            if is_user_in_pending == 0:
-                await approvaldb.update_one(
-                    {"chat_id": chat.id},
-                    {"$addToSet": {"pending_users": int(user.id)}},
-                    upsert=True,
-                )
-                buttons = {
-                    "✅ᴀᴄᴄᴇᴘᴛ": f"manual_approve_{user.id}",
-                    "🚫ᴅᴇᴄʟɪɴᴇ": f"manual_decline_{user.id}",
-                }
-                keyboard = ikb(buttons, int(2))
-                
-                username = f"@{user.username}" if user.username else "None"
-                
-                text = f"🔔 **ɴᴇᴡ ᴊᴏɪɴ ʀᴇǫᴜᴇsᴛ**\n\n"
-                text += f"**ᴜsᴇʀ:** {user.mention}\n"
-                text += f"**ᴜsᴇʀɴᴀᴍᴇ:** {username}\n"
-                text += f"**ᴜsᴇʀ ɪᴅ:** `{user.id}`\n\n"
-                text += f"**ᴀᴅᴍɪɴs ᴄᴀɴ ᴀᴘᴘʀᴏᴠᴇ ᴏʀ ᴅᴇᴄʟɪɴᴇ ʙᴇʟᴏᴡ:**"
-                
-                admin_data = [
-                    i
-                    async for i in app.get_chat_members(
-                        chat_id=message.chat.id,
-                        filter=ChatMembersFilter.ADMINISTRATORS,
-                    )
-                ]
-                for admin in admin_data:
-                    if admin.user.is_bot or admin.user.is_deleted:
-                        continue
-                    text += f"[\u2063](tg://user?id={admin.user.id})"
-                
-                return await app.send_message(chat.id, text, reply_markup=keyboard)
+            if not admin.user.is_bot and not admin.user.is_deleted
+        )
+        admin_tags.set(chat_id, tags)
+    return tags
+
+
+async def notify_admins(chat_id: int, user):
+    result = await approvaldb.update_one(
+        {"chat_id": chat_id},
+        {"$addToSet": {"pending_users": int(user.id)}},
+        upsert=True,
+    )
+    if not result.modified_count and not result.upserted_id:
+        return
+    buttons = {
+        "✅ᴀᴄᴄᴇᴘᴛ": f"manual_approve_{user.id}",
+        "🚫ᴅᴇᴄʟɪɴᴇ": f"manual_decline_{user.id}",
+    }
+    keyboard = ikb(buttons, int(2))
+
+    username = f"@{user.username}" if user.username else "None"
+
+    text = f"🔔 **ɴᴇᴡ ᴊᴏɪɴ ʀᴇǫᴜᴇsᴛ**\n\n"
+    text += f"**ᴜsᴇʀ:** {user.mention}\n"
+    text += f"**ᴜsᴇʀɴᴀᴍᴇ:** {username}\n"
+    text += f"**ᴜsᴇʀ ɪᴅ:** `{user.id}`\n\n"
+    text += f"**ᴀᴅᴍɪɴs ᴄᴀɴ ᴀᴘᴘʀᴏᴠᴇ ᴏʀ ᴅᴇᴄʟɪɴᴇ ʙᴇʟᴏᴡ:**"
+    text += await get_admin_tags(chat_id)
+
+    while True:
+        try:
+            return await app.send_message(chat_id, text, reply_markup=keyboard)
+        except FloodWait as e:
+            await asyncio.sleep(e.value)
+
+
+async def drain(chat_id: int):
+    # Let a burst of requests pile up, then handle them with one mode lookup.
+    await asyncio.sleep(1)
+    try:
+        while join_queue.get(chat_id):
+            users = join_queue.pop(chat_id)
+            mode = await get_mode(chat_id)
+            if mode == "automatic":
+                await approve_batch(chat_id, list(users))
+            elif mode == "manual":
+                for user in users.values():
+                    try:
+                        await notify_admins(chat_id, user)
+                    except Exception as e:
+                        LOGGER(__name__).warning(
+                            f"Join request of {user.id} in {chat_id} not announced: {e}"
+                        )
+    except Exception as e:
+        dropped = len(join_queue.pop(chat_id, {}))
+        LOGGER(__name__).error(
+            f"Join requests of {chat_id} failed, {dropped} queued requests dropped: {e}"
+        )
+    finally:
+        draining.pop(chat_id, None)
+
+
+@app.on_chat_join_request(filters.group)
+async def accept(client, message: ChatJoinRequest):
+    chat_id = message.chat.id
+    if approval_modes.get(chat_id, True) is None:
+        return
+    join_queue.setdefault(chat_id, {})[message.from_user.id] = message.from_user
+    if chat_id not in draining:
+        draining[chat_id] = asyncio.create_task(drain(chat_id))
 
 
 @app.on_callback_query(filters.regex("manual_(.*)"))
@@ -1,20 +1,7 @@
-import aiohttp
-from io import BytesIO
-from SONALI_MUSIC import app
+from SONALI_MUSIC import Carbon, app
 from pyrogram import filters
 
 
-
-async def make_carbon(code):
-    url = "https://carbonara.solopov.dev/api/cook"
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json={"code": code}) as resp:
-            image = BytesIO(await resp.read())
-    image.name = "carbon.png"
-    return image
-
-
-
 @app.on_message(filters.command("carbon"))
 async def _carbon(client, message):
     replied = message.reply_to_message
@@ -24,8 +11,7 @@ async def _carbon(client, message):
     if not (replied.text or replied.caption):
         return await message.reply_text("**ʀᴇᴘʟʏ ᴛᴏ ᴀ ᴛᴇxᴛ ᴍᴇssᴀɢᴇ ᴛᴏ ᴍᴀᴋᴇ ᴀ ᴄᴀʀʙᴏɴ.**")
     text = await message.reply("Processing...")
-    carbon = await make_carbon(replied.text or replied.caption)
+    carbon = await Carbon.generate(replied.text or replied.caption)
     await text.edit("**ᴜᴘʟᴏᴀᴅɪɴɢ...**")
     await message.reply_photo(carbon)
     await text.delete()
-    carbon.close()
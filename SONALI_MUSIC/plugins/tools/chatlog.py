@@ -5,6 +5,12 @@ from pyrogram import filters
 from pyrogram.types import(InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, InputMediaVideo, Message)
 from config import LOGGER_ID as LOG_GROUP_ID
 from SONALI_MUSIC import app 
+from SONALI_MUSIC.utils.chatcache import (
+    forget_chat,
+    get_invite_link,
+    get_member_count,
+    remember_chat,
+)
 from pyrogram.errors import RPCError
 from pyrogram.types import ChatMemberUpdated, InlineKeyboardMarkup, InlineKeyboardButton
 from os import environ
@@ -28,13 +34,18 @@ photo = [
 ]  
 
 
-@app.on_message(filters.new_chat_members, group=2)
+async def bot_joined(_, __, message: Message):
+    return any(member.id == app.id for member in message.new_chat_members)
+
+
+@app.on_message(filters.new_chat_members & filters.create(bot_joined), group=-2)
 async def join_watcher(_, message):    
     chat = message.chat
-    link = await app.export_chat_invite_link(message.chat.id)
+    remember_chat(chat)
+    link = await get_invite_link(chat.id)
     for members in message.new_chat_members:
         if members.id == app.id:
-            count = await app.get_chat_members_count(chat.id)
+            count = await get_member_count(chat.id)
 
             msg = (
                 f"#𝗕𝗢𝗧_𝗔𝗗𝗗𝗘𝗗_𝗡𝗘𝗪_𝗚𝗥𝗢𝗨𝗣\n\n"
@@ -55,7 +66,8 @@ async def join_watcher(_, message):
 
 @app.on_message(filters.left_chat_member)
 async def on_left_chat_member(_, message: Message):
-    if (await app.get_me()).id == message.left_chat_member.id:
+    if app.id == message.left_chat_member.id:
+        forget_chat(message.chat.id)
         remove_by = message.from_user.mention if message.from_user else "𝐔ɴᴋɴᴏᴡɴ 𝐔sᴇʀ"
         title = message.chat.title
         username = f"@{message.chat.username}" if message.chat.username else "𝐏ʀɪᴠᴀᴛᴇ 𝐂ʜᴀᴛ"
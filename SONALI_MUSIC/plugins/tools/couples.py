@@ -1,15 +1,18 @@
 import os 
-import random
-from datetime import datetime 
-from telegraph import upload_file
-from PIL import Image , ImageDraw
+from datetime import datetime, timedelta
 from pyrogram import *
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from pyrogram.enums import *
 
+import config
+
 #BOT FILE NAME
 from SONALI_MUSIC import app as app
-from SONALI_MUSIC.mongo.couples_db import _get_image, get_couple
+from SONALI_MUSIC.utils.cache import trim_files
+from SONALI_MUSIC.mongo.couples_db import _get_image, get_couple, save_couple
+from SONALI_MUSIC.utils.roster import sample_members
+from SONALI_MUSIC.utils.thumbnails import compose_couple
+from SONALI_MUSIC.utils.workers import run_in_worker
 
 POLICE = [
     [
@@ -29,109 +32,82 @@ def dt():
     
 
 def dt_tom():
-    a = (
-        str(int(dt()[0].split("/")[0]) + 1)
-        + "/"
-        + dt()[0].split("/")[1]
-        + "/"
-        + dt()[0].split("/")[2]
-    )
-    return a
-
-tomorrow = str(dt_tom())
-today = str(dt()[0])
-
-@app.on_message(filters.command("couples"))
-async def ctest(_, message):
-    cid = message.chat.id
-    if message.chat.type == ChatType.PRIVATE:
-        return await message.reply_text("✦ ᴛʜɪs ᴄᴏᴍᴍᴀɴᴅ ᴏɴʟʏ ᴡᴏʀᴋs ɪɴ ɢʀᴏᴜᴘs.")
+    return (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
+
+
+async def get_pfp(user) -> str:
+    # Profile photos are kept in cache/ by their unique id until they change.
+    if not user.photo:
+        return "SONALI_MUSIC/assets/upic.png"
+    path = os.path.realpath(f"cache/pfp_{user.photo.big_photo_unique_id}.png")
+    if os.path.isfile(path):
+        try:
+            os.utime(path)
+            return path
+        except OSError:
+            pass
     try:
-     #  is_selected = await get_couple(cid, today)
-     #  if not is_selected:
-         msg = await message.reply_text("❤️")
-         #GET LIST OF USERS
-         list_of_users = []
-
-         async for i in app.get_chat_members(message.chat.id, limit=50):
-             if not i.user.is_bot:
-               list_of_users.append(i.user.id)
-
-         c1_id = random.choice(list_of_users)
-         c2_id = random.choice(list_of_users)
-         while c1_id == c2_id:
-              c1_id = random.choice(list_of_users)
-
-
-         photo1 = (await app.get_chat(c1_id)).photo
-         photo2 = (await app.get_chat(c2_id)).photo
- 
-         N1 = (await app.get_users(c1_id)).mention 
-         N2 = (await app.get_users(c2_id)).mention
-         
-         try:
-            p1 = await app.download_media(photo1.big_file_id, file_name="pfp.png")
-         except Exception:
-            p1 = "SONALI_MUSIC/assets/upic.png"
-         try:
-            p2 = await app.download_media(photo2.big_file_id, file_name="pfp1.png")
-         except Exception:
-            p2 = "SONALI_MUSIC/assets/upic.png"
-            
-         img1 = Image.open(f"{p1}")
-         img2 = Image.open(f"{p2}")
-
-         img = Image.open("SONALI_MUSIC/assets/cppic.png")
-
-         img1 = img1.resize((390, 390))
-         img2 = img2.resize((390,390))
-
-         mask = Image.new('L', img1.size, 0)
-         draw = ImageDraw.Draw(mask) 
-         draw.ellipse((0, 0) + img1.size, fill=255)
-
-         mask1 = Image.new('L', img2.size, 0)
-         draw = ImageDraw.Draw(mask1) 
-         draw.ellipse((0, 0) + img2.size, fill=255)
-
-
-         img1.putalpha(mask)
-         img2.putalpha(mask1)
-
-         draw = ImageDraw.Draw(img)
+        path = await app.download_media(user.photo.big_file_id, file_name=path)
+    except Exception:
+        return "SONALI_MUSIC/assets/upic.png"
+    trim_files("cache/pfp_*.png", config.PFP_CACHE_SIZE)
+    return path
 
-         img.paste(img1, (91, 215), img1)
-         img.paste(img2, (805, 215), img2)
 
-         img.save(f'test_{cid}.png')
-    
-         TXT = f"""
+def couple_text(N1, N2):
+    return f"""
 **ㅤ◦•●◉✿ ᴄᴏᴜᴘʟᴇ ᴏғ ᴛʜᴇ ᴅᴀʏ  ✿◉●•◦
 ▬▭▬▭▬▭▬▭▬▭▬▭▬▭▬▭
 
  {N1} + {N2} = ♥︎
 
 ❖ ɴᴇxᴛ ᴄᴏᴜᴘʟᴇ sᴇʟᴇᴄᴛᴇᴅ ᴏɴ 
-❖ ᴅᴀᴛᴇ -`{tomorrow}`
+❖ ᴅᴀᴛᴇ -`{dt_tom()}`
 ▬▭▬▭▬▭▬▭▬▭▬▭▬▭▬▭**
 """
-    
-         await message.reply_photo(f"test_{cid}.png", caption=TXT, reply_markup=InlineKeyboardMarkup(POLICE),
-    )
-         await msg.delete()
-         a = upload_file(f"test_{cid}.png")
-         for x in a:
-           img = "https://graph.org/" + x
-           couple = {"c1_id": c1_id, "c2_id": c2_id}
-          
+
+
+@app.on_message(filters.command("couples"))
+async def ctest(_, message):
+    cid = message.chat.id
+    if message.chat.type == ChatType.PRIVATE:
+        return await message.reply_text("✦ ᴛʜɪs ᴄᴏᴍᴍᴀɴᴅ ᴏɴʟʏ ᴡᴏʀᴋs ɪɴ ɢʀᴏᴜᴘs.")
+    today = dt()[0]
+    try:
+        is_selected = await get_couple(cid, today)
+        if is_selected:
+            # Same answer all day, resend the photo already on Telegram.
+            u1, u2 = await app.get_users([is_selected["c1_id"], is_selected["c2_id"]])
+            return await message.reply_photo(
+                await _get_image(cid),
+                caption=couple_text(u1.mention, u2.mention),
+                reply_markup=InlineKeyboardMarkup(POLICE),
+            )
+    except Exception as e:
+        print(str(e))
+    out = f"cache/couple_{cid}.png"
+    try:
+        msg = await message.reply_text("❤️")
+        #PICK TWO USERS FROM THE ROSTER
+        c1_id, c2_id = await sample_members(cid, 2)
+        u1, u2 = await app.get_users([c1_id, c2_id])
+        p1, p2 = await get_pfp(u1), await get_pfp(u2)
+        await run_in_worker(compose_couple, p1, p2, out, timeout=30)
+
+        sent = await message.reply_photo(
+            out,
+            caption=couple_text(u1.mention, u2.mention),
+            reply_markup=InlineKeyboardMarkup(POLICE),
+        )
+        await msg.delete()
+        couple = {"c1_id": c1_id, "c2_id": c2_id}
+        await save_couple(cid, today, couple, sent.photo.file_id)
     except Exception as e:
         print(str(e))
     try:
-      os.remove(f"./downloads/pfp1.png")
-      os.remove(f"./downloads/pfp2.png")
-      os.remove(f"test_{cid}.png")
+        os.remove(out)
     except Exception:
-       pass
+        pass
          
 
 __mod__ = "ᴄᴏᴜᴘʟᴇ"
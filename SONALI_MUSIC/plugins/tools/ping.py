@@ -1,36 +1,15 @@
 from datetime import datetime
 from pyrogram import filters
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
-from SONALI_MUSIC import app
+from SONALI_MUSIC import Carbon, app
 from SONALI_MUSIC.core.call import Sona
-from SONALI_MUSIC.utils import bot_sys_stats
+from SONALI_MUSIC.utils import bot_sys_stats, stats_snapshot
 from SONALI_MUSIC.utils.decorators.language import language
 from SONALI_MUSIC.utils.inline import supp_markup
 from SONALI_MUSIC.utils.inline import close_markup
 from config import BANNED_USERS
-import aiohttp
 import asyncio
-from io import BytesIO
-from PIL import Image, ImageEnhance  # Add these imports
-
-async def make_carbon(code):
-    url = "https://carbonara.solopov.dev/api/cook"
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json={"code": code}) as resp:
-            image = BytesIO(await resp.read())
-
-    # Open the image using PIL
-    carbon_image = Image.open(image)
-
-    # Increase brightness
-    enhancer = ImageEnhance.Brightness(carbon_image)
-    bright_image = enhancer.enhance(1.7)  # Adjust the enhancement factor as needed
-
-    # Save the modified image to BytesIO object with increased quality
-    output_image = BytesIO()
-    bright_image.save(output_image, format='PNG', quality=95)  # Adjust quality as needed
-    output_image.name = "carbon.png"
-    return output_image
+import os
 
 @app.on_message(filters.command("ping", prefixes=["/"]) & ~BANNED_USERS)
 @language
@@ -51,13 +30,14 @@ async def ping_com(client, message: Message, _):
     await asyncio.sleep(2)
     await response.edit_caption("**sʏsᴛєϻ ᴅᴧᴛᴧ ᴧηᴧʟʏsєᴅ sᴜᴄᴄєssғᴜʟʟʏ !**")
     await asyncio.sleep(3)
-    await response.edit_caption("**sєηᴅɪηɢ sʏsᴛєϻ ᴧηᴧʟʏsєᴅ ᴅᴧᴛᴧ ᴘʟєᴧsє ᴡᴧɪᴛ...**")
+    # The edit is a real round trip to Telegram, the stats come from the snapshot.
     start = datetime.now()
-    pytgping = await Sona.ping()
+    await response.edit_caption("**sєηᴅɪηɢ sʏsᴛєϻ ᴧηᴧʟʏsєᴅ ᴅᴧᴛᴧ ᴘʟєᴧsє ᴡᴧɪᴛ...**")
+    resp = round((datetime.now() - start).total_seconds() * 1000, 3)
+    pytgping = stats_snapshot.get("ping") or await Sona.ping()
     UP, CPU, RAM, DISK = await bot_sys_stats()
-    resp = (datetime.now() - start).microseconds / 1000
     text =  _["ping_2"].format(resp, app.name, UP, RAM, CPU, DISK, pytgping)
-    carbon = await make_carbon(text)
+    carbon = await Carbon.generate(text, cache=False)
     captions = "**ㅤ  ❍ ᴘɪηɢ...ᴘσηɢ...ᴘɪηɢ\nㅤ  ❍ ᴅɪηɢ...ᴅσηɢ...ᴅɪηɢ**"
     await message.reply_photo((carbon), caption=captions,
     reply_markup=InlineKeyboardMarkup(
@@ -86,6 +66,10 @@ async def ping_com(client, message: Message, _):
     ),
         )
     await response.delete()
+    try:
+        os.remove(carbon)
+    except OSError:
+        pass
 
     close_button = InlineKeyboardButton("⌯ ᴄʟᴏsᴇ ⌯", callback_data="close_data")
     inline_keyboard = InlineKeyboardMarkup([[close_button]])
@@ -1,7 +1,15 @@
+import asyncio
+import hashlib
+import json
+import os
 from io import BytesIO
 from pyrogram import Client, filters
 from pyrogram.types import Message
+import config
 from SONALI_MUSIC import app
+from SONALI_MUSIC.utils.cache import TTLCache, trim_files
+from SONALI_MUSIC.utils.thumbnails import render_quote
+from SONALI_MUSIC.utils.workers import run_in_worker
 from httpx import AsyncClient, Timeout
 # -----------------------------------------------------------------
 fetch = AsyncClient(
@@ -16,6 +24,10 @@ fetch = AsyncClient(
 # ------------------------------------------------------------------------
 class QuotlyException(Exception):
     pass
+
+# sha1 of the quoted messages -> file_id of the sticker already sent once
+quote_cache = TTLCache(config.QUOTE_CACHE_TTL, maxsize=2048)
+rendering = {}
 # --------------------------------------------------------------------------
 async def get_message_sender_id(ctx: Message):
     if ctx.forward_date:
@@ -224,11 +236,84 @@ async def pyrogram_to_quotly(messages, is_reply):
         else:
             the_message_dict_to_append["replyMessage"] = {}
         payload["messages"].append(the_message_dict_to_append)
-    r = await fetch.post("https://bot.lyo.su/quote/generate.png", json=payload)
-    if not r.is_error:
+    return payload
+# ------------------------------------------------------------------------------------------
+def quote_key(payload) -> str:
+    # file_ids are not stable across fetches, the photo unique id is.
+    messages = [
+        {**m, "from": {**m["from"], "photo": (m["from"]["photo"] or {}).get("small_photo_unique_id", "")}}
+        for m in payload["messages"]
+    ]
+    return hashlib.sha1(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+
+
+async def get_avatar(photo):
+    # pyrogram puts relative file names next to the script, hence the realpath.
+    if not photo:
+        return None
+    path = os.path.realpath(f"cache/avatar_{photo['small_photo_unique_id']}.jpg")
+    if os.path.isfile(path):
+        try:
+            os.utime(path)
+            return path
+        except OSError:
+            pass
+    try:
+        path = await app.download_media(photo["small_file_id"], file_name=path)
+    except Exception:
+        return None
+    trim_files("cache/avatar_*.jpg", config.AVATAR_CACHE_SIZE)
+    return path
+
+
+async def make_quote(payload) -> bytes:
+    try:
+        r = await fetch.post(
+            "https://bot.lyo.su/quote/generate.png",
+            json=payload,
+            timeout=config.QUOTE_REMOTE_TIMEOUT,
+        )
+        if r.is_error:
+            raise QuotlyException(r.json())
         return r.read()
-    else:
-        raise QuotlyException(r.json())
+    except Exception:
+        if config.QUOTE_LOCAL_FALLBACK != str(True):
+            raise
+    items = [
+        {
+            "id": m["from"]["id"],
+            "name": m["from"]["name"],
+            "text": m["text"],
+            "avatar": await get_avatar(m["from"]["photo"]),
+            "reply": (m["replyMessage"]["name"], m["replyMessage"]["text"]) if m["replyMessage"] else None,
+        }
+        for m in payload["messages"]
+    ]
+    return await run_in_worker(render_quote, items, timeout=30)
+
+
+async def get_quote(key: str, payload) -> bytes:
+    # The same quote requested several times at once is rendered once.
+    if key not in rendering:
+        rendering[key] = asyncio.ensure_future(make_quote(payload))
+        rendering[key].add_done_callback(lambda _: rendering.pop(key, None))
+    return await asyncio.shield(rendering[key])
+
+
+async def send_quote(ctx: Message, messages, is_reply):
+    payload = await pyrogram_to_quotly(messages, is_reply=is_reply)
+    key = quote_key(payload)
+    file_id = quote_cache.get(key)
+    if file_id:
+        try:
+            return await ctx.reply_sticker(file_id)
+        except Exception:
+            quote_cache.pop(key)
+    bio_sticker = BytesIO(await get_quote(key, payload))
+    bio_sticker.name = "misskatyquote_sticker.webp"
+    sent = await ctx.reply_sticker(bio_sticker)
+    quote_cache.set(key, sent.sticker.file_id)
+    return sent
 # ------------------------------------------------------------------------------------------
 
 def isArgInt(txt) -> list:
@@ -249,7 +334,7 @@ async def msg_quotly_cmd(self: app, ctx: Message):
         check_arg = isArgInt(ctx.command[1])
         if check_arg[0]:
             if check_arg[1] < 2 or check_arg[1] > 10:
-                return await ctx.reply_msg("Invalid range", del_in=6)
+                return await ctx.reply_text("Invalid range")
             try:
                 messages = [
                     i
@@ -266,24 +351,18 @@ async def msg_quotly_cmd(self: app, ctx: Message):
             except Exception:
                 return await ctx.reply_text("🤷🏻‍♂️")
             try:
-                make_quotly = await pyrogram_to_quotly(messages, is_reply=is_reply)
-                bio_sticker = BytesIO(make_quotly)
-                bio_sticker.name = "misskatyquote_sticker.webp"
-                return await ctx.reply_sticker(bio_sticker)
+                return await send_quote(ctx, messages, is_reply)
             except Exception:
-                return await ctx.reply_msg("🤷🏻‍♂️")
+                return await ctx.reply_text("🤷🏻‍♂️")
     try:
         messages_one = await self.get_messages(
             chat_id=ctx.chat.id, message_ids=ctx.reply_to_message.id, replies=-1
         )
         messages = [messages_one]
     except Exception:
-        return await ctx.reply_msg("🤷🏻‍♂️")
+        return await ctx.reply_text("🤷🏻‍♂️")
     try:
-        make_quotly = await pyrogram_to_quotly(messages, is_reply=is_reply)
-        bio_sticker = BytesIO(make_quotly)
-        bio_sticker.name = "misskatyquote_sticker.webp"
-        return await ctx.reply_sticker(bio_sticker)
+        return await send_quote(ctx, messages, is_reply)
     except Exception as e:
-        return await ctx.reply_msg(f"ERROR: {e}")
+        return await ctx.reply_text(f"ERROR: {e}")
 # ---------------------------------------------------------------------------------
@@ -19,6 +19,7 @@ from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils.database import get_assistant, get_authuser_names, get_cmode
 from SONALI_MUSIC.utils.decorators import ActualAdminCB, AdminActual, language
 from SONALI_MUSIC.utils.formatters import alpha_to_int, get_readable_time
+from SONALI_MUSIC.utils.stream.queue import Queue
 from config import BANNED_USERS, adminlist, lyrical
 BOT_TOKEN = getenv("BOT_TOKEN", "")
 MONGO_DB_URI = getenv("MONGO_DB_URI", "")
@@ -69,7 +70,7 @@ async def restartbot(client, message: Message, _):
     mystic = await message.reply_text(_["reload_4"].format(app.mention))
     await asyncio.sleep(1)
     try:
-        db[message.chat.id] = []
+        db[message.chat.id] = Queue()
         await Sona.stop_stream_force(message.chat.id)
     except:
         pass
@@ -96,7 +97,7 @@ async def restartbot(client, message: Message, _):
         except:
             pass
         try:
-            db[chat_id] = []
+            db[chat_id] = Queue()
             await Sona.stop_stream_force(chat_id)
         except:
             pass
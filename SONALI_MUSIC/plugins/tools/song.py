@@ -4,10 +4,8 @@ import asyncio
 import requests
 import wget
 import time
-import yt_dlp
 from urllib.parse import urlparse
 from youtube_search import YoutubeSearch
-from yt_dlp import YoutubeDL
 from SONALI_MUSIC import app, YouTube
 from pyrogram import filters
 from pyrogram import Client, filters
@@ -315,8 +313,10 @@ async def song_download_cb(client, CallbackQuery, _):
 
     yturl = f"https://www.youtube.com/watch?v={vidid}"
 
-    with yt_dlp.YoutubeDL({"quiet": True}) as ytdl:
-        x = ytdl.extract_info(yturl, download=False)
+    try:
+        x = await YouTube.info(vidid, True)
+    except Exception as e:
+        return await mystic.edit_text(_["song_9"].format(e))
 
     title = (x["title"]).title()
     title = re.sub("\W+", " ", title)
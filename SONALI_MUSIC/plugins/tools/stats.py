@@ -10,15 +10,23 @@ from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from SONALI_MUSIC import app
+from SONALI_MUSIC.core.router import handler_stats
 from SONALI_MUSIC.core.userbot import assistants
 from SONALI_MUSIC.misc import SUDOERS, mongodb
 from SONALI_MUSIC.plugins import ALL_MODULES
 from SONALI_MUSIC.utils.database import get_served_chats, get_served_users, get_sudoers
 from SONALI_MUSIC.utils.decorators.language import language, languageCB
 from SONALI_MUSIC.utils.inline.stats import back_stats_buttons, stats_buttons
+from SONALI_MUSIC.utils.sys import sample_once, stats_snapshot
 from config import BANNED_USERS
 
 
+async def served_counts():
+    if "served_chats" in stats_snapshot:
+        return stats_snapshot["served_chats"], stats_snapshot["served_users"]
+    return len(await get_served_chats()), len(await get_served_users())
+
+
 @app.on_message(filters.command(["stats", "gstats"]) & filters.group & ~BANNED_USERS)
 @language
 async def stats_global(client, message: Message, _):
@@ -51,8 +59,7 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(app.mention))
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats, served_users = await served_counts()
     text = _["gstats_3"].format(
         app.mention,
         len(assistants),
@@ -95,15 +102,16 @@ async def bot_stats(client, CallbackQuery, _):
             cpu_freq = f"{round(cpu_freq, 2)}ᴍʜᴢ"
     except:
         cpu_freq = "ғᴀɪʟᴇᴅ ᴛᴏ ғᴇᴛᴄʜ"
-    hdd = psutil.disk_usage("/")
+    if not stats_snapshot:
+        await sample_once()
+    hdd = stats_snapshot["disk"]
     total = hdd.total / (1024.0**3)
     used = hdd.used / (1024.0**3)
     free = hdd.free / (1024.0**3)
-    call = await mongodb.command("dbstats")
+    call = stats_snapshot.get("dbstats") or await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats, served_users = await served_counts()
     text = _["gstats_5"].format(
         app.mention,
         len(ALL_MODULES),
@@ -134,3 +142,15 @@ async def bot_stats(client, CallbackQuery, _):
         await CallbackQuery.message.reply_photo(
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
+
+
+@app.on_message(filters.command(["handlers"]) & SUDOERS)
+async def handlers_stats(client, message: Message):
+    top = sorted(handler_stats.items(), key=lambda x: x[1][1], reverse=True)[:15]
+    if not top:
+        return await message.reply_text("» ɴᴏ ʜᴀɴᴅʟᴇʀ ᴛɪᴍɪɴɢs ʏᴇᴛ.")
+    text = "\n".join(
+        f"<code>{name.replace('SONALI_MUSIC.plugins.', '')}</code> : {calls}x, {total / calls * 1000:.1f}ms avg"
+        for name, (calls, total) in top
+    )
+    await message.reply_text(f"<b>» sʟᴏᴡᴇsᴛ ʜᴀɴᴅʟᴇʀs :</b>\n\n{text}")
@@ -1,14 +1,78 @@
+import asyncio
+import hashlib
+import unicodedata
+
 from pyrogram import filters
 from pyrogram.types import *
 from SONALI_MUSIC import app
 from gpytranslate import Translator
 
+import config
+from SONALI_MUSIC.utils.cache import TTLCache
+
 #.......
 
 trans = Translator()
 
+# (text hash, source, dest) -> (source, translated text)
+tr_cache = TTLCache(config.TR_CACHE_TTL, maxsize=config.TR_CACHE_SIZE)
+translating = {}
+
+# Scripts written by a single language, Devanagari and Arabic are shared
+# (hi/mr/ne, ar/fa/ur) so those still go through google.
+SCRIPTS = {
+    "GURMUKHI": "pa",
+    "GUJARATI": "gu",
+    "TAMIL": "ta",
+    "TELUGU": "te",
+    "KANNADA": "kn",
+    "MALAYALAM": "ml",
+    "THAI": "th",
+    "HANGUL": "ko",
+    "HIRAGANA": "ja",
+    "KATAKANA": "ja",
+    "GREEK": "el",
+    "GEORGIAN": "ka",
+    "ARMENIAN": "hy",
+}
+
 #......
 
+
+def detect_script(text: str):
+    # Local fast path, None when the script doesn't pin the language down.
+    found = set()
+    for char in text:
+        if not char.isalpha():
+            continue
+        script = unicodedata.name(char, "").split(" ")[0]
+        found.add(SCRIPTS.get(script))
+        if len(found) > 1:
+            return None
+    return found.pop() if found else None
+
+
+async def _translate(text: str, source: str, dest: str):
+    # Without a known source google detects it in the same call.
+    translation = await trans(text, sourcelang=source, targetlang=dest)
+    if source == "auto":
+        source = translation.lang
+    return source, translation.text
+
+
+async def get_translation(text: str, source: str, dest: str):
+    key = (hashlib.sha1(text.encode()).hexdigest(), source, dest)
+    result = tr_cache.get(key)
+    if result:
+        return result
+    if key not in translating:
+        translating[key] = asyncio.ensure_future(_translate(text, source, dest))
+        translating[key].add_done_callback(lambda _: translating.pop(key, None))
+    result = await asyncio.shield(translating[key])
+    tr_cache.set(key, result)
+    return result
+
+
 @app.on_message(filters.command("tr"))
 async def translate(_, message) -> None:
     reply_msg = message.reply_to_message
@@ -25,14 +89,14 @@ async def translate(_, message) -> None:
             source = args.split("//")[0]
             dest = args.split("//")[1]
         else:
-            source = await trans.detect(to_translate)
+            source = detect_script(to_translate) or "auto"
             dest = args
     except IndexError:
-        source = await trans.detect(to_translate)
+        source = detect_script(to_translate) or "auto"
         dest = "en"
-    translation = await trans(to_translate, sourcelang=source, targetlang=dest)
+    source, translation = await get_translation(to_translate, source, dest)
     reply = (
         f"ᴛʀᴀɴsʟᴀᴛᴇᴅ ғʀᴏᴍ {source} to {dest}:\n"
-        f"{translation.text}"
+        f"{translation}"
     )
     await message.reply_text(reply)
@@ -0,0 +1,61 @@
+import glob
+import os
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, ttl: int, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: int = None):
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def expire(self):
+        now = time.monotonic()
+        for key in [k for k, (e, _) in self._data.items() if e < now]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._data)
+
+
+def trim_files(pattern: str, keep: int):
+    # Keeps the `keep` newest files matching pattern, cache hits refresh the mtime.
+    files = []
+    for path in glob.glob(pattern):
+        try:
+            files.append((os.path.getmtime(path), path))
+        except OSError:
+            pass
+    for _, path in sorted(files)[: max(0, len(files) - keep)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
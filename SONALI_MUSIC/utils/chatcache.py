@@ -0,0 +1,56 @@
+import config
+from SONALI_MUSIC import app
+from SONALI_MUSIC.utils.cache import TTLCache
+
+# title, username, invite link and member count per chat
+chat_cache = TTLCache(config.CHAT_CACHE_TTL, maxsize=4096)
+
+
+def remember_chat(chat, full: bool = False):
+    # Chats from updates carry no invite link, `full` marks a get_chat result.
+    meta = chat_cache.get(chat.id) or {}
+    meta["title"] = chat.title
+    meta["username"] = chat.username
+    if full:
+        meta["full"] = True
+    if getattr(chat, "invite_link", None):
+        meta["invite_link"] = chat.invite_link
+    if getattr(chat, "members_count", None):
+        meta["members"] = chat.members_count
+    chat_cache.set(chat.id, meta)
+    return meta
+
+
+def forget_chat(chat_id: int):
+    chat_cache.pop(chat_id)
+
+
+async def get_chat_meta(chat_id: int) -> dict:
+    meta = chat_cache.get(chat_id)
+    if meta is None or "title" not in meta:
+        meta = remember_chat(await app.get_chat(chat_id), full=True)
+    return meta
+
+
+async def get_invite_link(chat_id: int) -> str:
+    # get_chat hands back the primary link as is, exporting would revoke it.
+    meta = await get_chat_meta(chat_id)
+    if not meta.get("invite_link") and not meta.get("full"):
+        meta = remember_chat(await app.get_chat(chat_id), full=True)
+    if not meta.get("invite_link"):
+        meta["invite_link"] = await app.export_chat_invite_link(chat_id)
+    return meta["invite_link"]
+
+
+def drop_invite_link(chat_id: int):
+    meta = chat_cache.get(chat_id)
+    if meta:
+        meta.pop("invite_link", None)
+        meta.pop("full", None)
+
+
+async def get_member_count(chat_id: int) -> int:
+    meta = await get_chat_meta(chat_id)
+    if not meta.get("members"):
+        meta["members"] = await app.get_chat_members_count(chat_id)
+    return meta["members"]
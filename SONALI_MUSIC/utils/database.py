@@ -1,8 +1,10 @@
 import random
+import time
 from typing import Dict, List, Union
 
 from SONALI_MUSIC import userbot
 from SONALI_MUSIC.core.mongo import mongodb
+from SONALI_MUSIC.utils.state import store
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -15,6 +17,7 @@ channeldb = mongodb.cplaymode
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
 langdb = mongodb.language
+membershipdb = mongodb.assistantchats
 onoffdb = mongodb.onoffper
 playmodedb = mongodb.playmode
 playtypedb = mongodb.playtypedb
@@ -198,19 +201,23 @@ async def set_upvotes(chat_id: int, mode: int):
 
 async def is_autoend() -> bool:
     chat_id = 1234
-    user = await autoenddb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    mode, expires = autoend.get(chat_id) or (None, 0)
+    if expires < time.time():
+        # Another shard may have toggled it, look again after a minute.
+        mode = bool(await autoenddb.find_one({"chat_id": chat_id}))
+        autoend[chat_id] = (mode, time.time() + 60)
+    return mode
 
 
 async def autoend_on():
     chat_id = 1234
+    autoend[chat_id] = (True, time.time() + 60)
     await autoenddb.insert_one({"chat_id": chat_id})
 
 
 async def autoend_off():
     chat_id = 1234
+    autoend[chat_id] = (False, time.time() + 60)
     await autoenddb.delete_one({"chat_id": chat_id})
 
 
@@ -327,17 +334,69 @@ async def is_active_chat(chat_id: int) -> bool:
 async def add_active_chat(chat_id: int):
     if chat_id not in active:
         active.append(chat_id)
+        await store.add("active", chat_id)
 
 
 async def remove_active_chat(chat_id: int):
     if chat_id in active:
         active.remove(chat_id)
+        await store.discard("active", chat_id)
+        await touch_membership(chat_id)
+
+
+# Chats every assistant is in and since when nothing was played there.
+async def add_membership(user_id: int, chat_id: int):
+    await membershipdb.update_one(
+        {"user_id": user_id, "chat_id": chat_id},
+        {"$set": {"idle_since": time.time()}},
+        upsert=True,
+    )
+
+
+async def touch_membership(chat_id: int):
+    await membershipdb.update_many(
+        {"chat_id": chat_id}, {"$set": {"idle_since": time.time()}}
+    )
+
+
+async def remove_membership(user_id: int, chat_id: int):
+    await membershipdb.delete_one({"user_id": user_id, "chat_id": chat_id})
+
+
+async def has_memberships(user_id: int) -> bool:
+    return bool(await membershipdb.find_one({"user_id": user_id}))
+
+
+async def get_stale_memberships(
+    user_id: int, idle: int, limit: int, keep: list = ()
+) -> list:
+    cursor = (
+        membershipdb.find(
+            {
+                "user_id": user_id,
+                "chat_id": {"$nin": list(keep)},
+                "idle_since": {"$lt": time.time() - idle},
+            }
+        )
+        .sort("idle_since", 1)
+        .limit(limit)
+    )
+    return [entry["chat_id"] async for entry in cursor]
+
+
+async def get_all_active_chats() -> list:
+    # Active chats of every shard, get_active_chats only has this process.
+    return await store.members("active")
 
 
 async def get_active_video_chats() -> list:
     return activevideo
 
 
+async def get_all_active_video_chats() -> list:
+    return await store.members("activevideo")
+
+
 async def is_active_video_chat(chat_id: int) -> bool:
     if chat_id not in activevideo:
         return False
@@ -348,11 +407,13 @@ async def is_active_video_chat(chat_id: int) -> bool:
 async def add_active_video_chat(chat_id: int):
     if chat_id not in activevideo:
         activevideo.append(chat_id)
+        await store.add("activevideo", chat_id)
 
 
 async def remove_active_video_chat(chat_id: int):
     if chat_id in activevideo:
         activevideo.remove(chat_id)
+        await store.discard("activevideo", chat_id)
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
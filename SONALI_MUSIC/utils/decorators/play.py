@@ -3,6 +3,8 @@ import asyncio
 from pyrogram.enums import ChatMemberStatus
 from pyrogram.errors import (
     ChatAdminRequired,
+    InviteHashExpired,
+    InviteHashInvalid,
     InviteRequestSent,
     UserAlreadyParticipant,
     UserNotParticipant,
@@ -11,7 +13,9 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from SONALI_MUSIC import YouTube, app
 from SONALI_MUSIC.misc import SUDOERS
+from SONALI_MUSIC.utils.chatcache import drop_invite_link, get_invite_link
 from SONALI_MUSIC.utils.database import (
+    add_membership,
     get_assistant,
     get_cmode,
     get_lang,
@@ -141,7 +145,7 @@ def PlayWrapper(command):
                             pass
                     else:
                         try:
-                            invitelink = await app.export_chat_invite_link(chat_id)
+                            invitelink = await get_invite_link(chat_id)
                         except ChatAdminRequired:
                             return await message.reply_text(_["call_1"])
                         except Exception as e:
@@ -168,6 +172,21 @@ def PlayWrapper(command):
                     await myu.edit(_["call_5"].format(app.mention))
                 except UserAlreadyParticipant:
                     pass
+                except (InviteHashExpired, InviteHashInvalid):
+                    # The remembered link was revoked, fetch the current one once.
+                    links.pop(chat_id, None)
+                    drop_invite_link(chat_id)
+                    try:
+                        invitelink = (await get_invite_link(chat_id)).replace(
+                            "https://t.me/+", "https://t.me/joinchat/"
+                        )
+                        await userbot.join_chat(invitelink)
+                    except UserAlreadyParticipant:
+                        pass
+                    except Exception as e:
+                        return await message.reply_text(
+                            _["call_3"].format(app.mention, type(e).__name__)
+                        )
                 except Exception as e:
                     return await message.reply_text(
                         _["call_3"].format(app.mention, type(e).__name__)
@@ -180,6 +199,8 @@ def PlayWrapper(command):
                 except:
                     pass
 
+            await add_membership(userbot.id, chat_id)
+
         return await command(
             client,
             message,
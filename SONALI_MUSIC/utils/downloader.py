@@ -1,34 +1,40 @@
-from os import path
 import yt_dlp
-from yt_dlp.utils import DownloadError
-
-ytdl = yt_dlp.YoutubeDL(
-    {
-        "outtmpl": "downloads/%(id)s.%(ext)s",
-        "format": "bestaudio[ext=m4a]",
-        "geo_bypass": True,
-        "nocheckcertificate": True,
-    }
- )
-
-
-def download(url: str, my_hook) -> str:       
-    ydl_optssx = {
-        'format' : 'bestaudio[ext=m4a]',
-        "outtmpl": "downloads/%(id)s.%(ext)s",
-        "geo_bypass": True,
-        "nocheckcertificate": True,
-        'quiet': True,
-        'no_warnings': True,
-    }
-    info = ytdl.extract_info(url, False)
-    try:
-        x = yt_dlp.YoutubeDL(ydl_optssx)
-        x.add_progress_hook(my_hook)
-        dloader = x.download([url])
-    except Exception as y_e:
-        return print(y_e)
-    else:
-        dloader
-    xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
-    return xyz
+
+import config
+from SONALI_MUSIC.utils.workers import run_in_worker
+
+ytdl_opts = {
+    "outtmpl": "downloads/%(id)s.%(ext)s",
+    "geo_bypass": True,
+    "nocheckcertificate": True,
+    "quiet": True,
+    "no_warnings": True,
+}
+
+
+def _extract(url: str, opts: dict, download: bool) -> dict:
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=download)
+        return ydl.sanitize_info(info)
+
+
+async def extract_info(url: str, opts: dict = None) -> dict:
+    return await run_in_worker(
+        _extract,
+        url,
+        {**ytdl_opts, **(opts or {})},
+        False,
+        timeout=config.YTDL_EXTRACT_TIMEOUT,
+        pool="download",
+    )
+
+
+async def download(url: str, opts: dict = None) -> dict:
+    return await run_in_worker(
+        _extract,
+        url,
+        {**ytdl_opts, **(opts or {})},
+        True,
+        timeout=config.YTDL_DOWNLOAD_TIMEOUT,
+        pool="download",
+    )
@@ -1,14 +1,16 @@
 import math
 import os
+import subprocess
 
 from PIL import Image
 from pyrogram import Client, raw
 from pyrogram.file_id import FileId
+
 # ------------------
 STICKER_DIMENSIONS = (512, 512)
 
 # -------------------
-async def resize_file_to_sticker_size(file_path: str) -> str:
+def resize_image(file_path: str, out: str) -> str:
     im = Image.open(file_path)
     if (im.width, im.height) < STICKER_DIMENSIONS:
         size1 = im.width
@@ -27,12 +29,53 @@ async def resize_file_to_sticker_size(file_path: str) -> str:
         im = im.resize(sizenew)
     else:
         im.thumbnail(STICKER_DIMENSIONS)
+    part = f"{out}.part"
+    try:
+        im.save(part, "PNG")
+        os.replace(part, out)
+    finally:
+        if os.path.exists(part):
+            os.remove(part)
+    return out
+
+
+def transcode_video(file_path: str, out: str) -> str:
+    # Video stickers: vp9 webm, 512px on the long side, 3 seconds, no audio.
+    part = f"{out}.part"
     try:
-        os.remove(file_path)
-        file_path = f"{file_path}.png"
-        return file_path
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-nostdin",
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                file_path,
+                "-t",
+                "3",
+                "-an",
+                "-vf",
+                "scale=512:512:force_original_aspect_ratio=decrease,fps=30",
+                "-c:v",
+                "libvpx-vp9",
+                "-b:v",
+                "400K",
+                "-pix_fmt",
+                "yuva420p",
+                "-f",
+                "webm",
+                part,
+            ],
+            check=True,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+        )
+        os.replace(part, out)
     finally:
-        im.save(file_path)
+        if os.path.exists(part):
+            os.remove(part)
+    return out
 
 
 async def upload_document(
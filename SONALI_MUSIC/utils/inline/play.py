@@ -28,7 +28,7 @@ def track_markup(_, videoid, user_id, channel, fplay):
     return buttons
 
 
-def stream_markup_timer(_, chat_id, played, dur):
+def timer_bar(played, dur):
     played_sec = time_to_seconds(played)
     duration_sec = time_to_seconds(dur)
     percentage = (played_sec / duration_sec) * 100
@@ -53,6 +53,11 @@ def stream_markup_timer(_, chat_id, played, dur):
         bar = "————————🅢︎—"
     else:
         bar = "🅚︎—————————"
+    return bar
+
+
+def stream_markup_timer(_, chat_id, played, dur):
+    bar = timer_bar(played, dur)
     buttons = [
                 [
             InlineKeyboardButton(
@@ -0,0 +1,69 @@
+import asyncio
+import random
+
+import config
+from SONALI_MUSIC import app
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.cache import TTLCache
+
+# chat_id -> {user_id: (first_name, username, is_bot)}, least recently used go first
+rosters = TTLCache(config.ROSTER_TTL, maxsize=config.ROSTER_CACHE_SIZE)
+building = {}
+
+
+def _entry(user):
+    return user.first_name, user.username, user.is_bot
+
+
+async def _build(chat_id: int):
+    members = {}
+    async for m in app.get_chat_members(chat_id):
+        if m.user:
+            members[m.user.id] = _entry(m.user)
+    rosters.set(chat_id, members)
+    LOGGER(__name__).info(f"Built roster for {chat_id} with {len(members)} members.")
+    return members
+
+
+async def get_roster(chat_id: int) -> dict:
+    # One paginated fetch per chat, joins and leaves keep it current afterwards.
+    members = rosters.get(chat_id)
+    if members is not None:
+        return members
+    task = building.get(chat_id)
+    if not task:
+        task = building[chat_id] = asyncio.create_task(_build(chat_id))
+        task.add_done_callback(lambda _: building.pop(chat_id, None))
+    return await asyncio.shield(task)
+
+
+def add_member(chat_id: int, user):
+    members = rosters.get(chat_id)
+    if members is not None:
+        members[user.id] = _entry(user)
+
+
+def remove_member(chat_id: int, user_id: int):
+    members = rosters.get(chat_id)
+    if members is not None:
+        members.pop(user_id, None)
+
+
+def drop_roster(chat_id: int):
+    rosters.pop(chat_id)
+
+
+async def iter_members(chat_id: int, bots: bool = True):
+    members = list((await get_roster(chat_id)).items())
+    for n, (user_id, (first_name, username, is_bot)) in enumerate(members, 1):
+        if is_bot and not bots:
+            continue
+        yield user_id, first_name, username
+        if n % 1000 == 0:
+            await asyncio.sleep(0)
+
+
+async def sample_members(chat_id: int, k: int, bots: bool = False) -> list:
+    roster = await get_roster(chat_id)
+    pool = [user_id for user_id, entry in roster.items() if bots or not entry[2]]
+    return random.sample(pool, k)
@@ -0,0 +1,68 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from SONALI_MUSIC.logging import LOGGER
+
+
+class Scheduler:
+    # One task sleeping until the earliest deadline. Jobs are keyed, scheduling
+    # a key again replaces its job and cancelled entries are skipped when popped.
+    def __init__(self):
+        self.heap = []
+        self.jobs = {}
+        self.seq = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def schedule(self, key, delay: float, func, *args):
+        self.cancel(key)
+        entry = [time.monotonic() + delay, next(self.seq), key, func, args]
+        self.jobs[key] = entry
+        heapq.heappush(self.heap, entry)
+        if len(self.heap) > 2 * len(self.jobs) + 64:
+            self.heap = [e for e in self.heap if e[3]]
+            heapq.heapify(self.heap)
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        elif self.heap[0] is entry:
+            self.wakeup.set()
+
+    def cancel(self, key):
+        entry = self.jobs.pop(key, None)
+        if entry:
+            entry[3] = None
+
+    def pending(self, key) -> bool:
+        return key in self.jobs
+
+    async def run(self):
+        while True:
+            while self.heap and not self.heap[0][3]:
+                heapq.heappop(self.heap)
+            timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+            if timeout is None or timeout > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, _, key, func, args = heapq.heappop(self.heap)
+            del self.jobs[key]
+            try:
+                result = func(*args)
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(self.guard(key, result))
+            except Exception as e:
+                LOGGER(__name__).warning(f"Scheduled job {key} failed: {e}")
+
+    async def guard(self, key, coro):
+        try:
+            await coro
+        except Exception as e:
+            LOGGER(__name__).warning(f"Scheduled job {key} failed: {e}")
+
+
+scheduler = Scheduler()
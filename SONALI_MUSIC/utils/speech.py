@@ -0,0 +1,10 @@
+from io import BytesIO
+
+from gtts import gTTS
+
+
+def synthesize(text: str, lang: str) -> bytes:
+    # Runs in the worker pool, gTTS makes blocking http calls.
+    audio = BytesIO()
+    gTTS(text=text, lang=lang).write_to_fp(audio)
+    return audio.getvalue()
@@ -0,0 +1,88 @@
+from pyrogram import StopPropagation
+from pyrogram.handlers import (
+    CallbackQueryHandler,
+    ChatMemberUpdatedHandler,
+    InlineQueryHandler,
+    MessageHandler,
+)
+from pyrogram.types import CallbackQuery, InlineQuery
+
+import config
+from SONALI_MUSIC.core.mongo import mongodb
+
+SHARD_GROUP = -1000
+
+
+class MemoryStore:
+    # Default single process store, sets live in this process only.
+    def __init__(self):
+        self.sets = {}
+
+    async def add(self, key: str, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    async def discard(self, key: str, member):
+        self.sets.get(key, set()).discard(member)
+
+    async def members(self, key: str) -> list:
+        return list(self.sets.get(key, ()))
+
+    async def reset(self):
+        self.sets.clear()
+
+
+class MongoStore:
+    # Shared between shards, every entry remembers which shard wrote it.
+    def __init__(self):
+        self.col = mongodb.runtime_state
+
+    async def add(self, key: str, member):
+        await self.col.update_one(
+            {"key": key, "member": member},
+            {"$set": {"shard": config.SHARD_ID}},
+            upsert=True,
+        )
+
+    async def discard(self, key: str, member):
+        await self.col.delete_one({"key": key, "member": member})
+
+    async def members(self, key: str) -> list:
+        return await self.col.distinct("member", {"key": key})
+
+    async def reset(self):
+        # Whatever this shard left behind before a restart is stale.
+        await self.col.delete_many({"shard": config.SHARD_ID})
+
+
+store = MongoStore() if config.STATE_STORE == "mongo" else MemoryStore()
+
+
+def owns_chat(chat_id: int) -> bool:
+    return abs(chat_id) % config.SHARD_COUNT == config.SHARD_ID
+
+
+async def _guard(_, update):
+    if isinstance(update, InlineQuery):
+        chat = None
+    elif isinstance(update, CallbackQuery):
+        chat = update.message.chat if update.message else None
+    else:
+        chat = update.chat
+    if chat is None:
+        # Inline queries and inline message buttons are answered by shard 0.
+        if config.SHARD_ID != 0:
+            raise StopPropagation
+    elif not owns_chat(chat.id):
+        raise StopPropagation
+
+
+def shard_guard(app):
+    if config.SHARD_COUNT <= 1:
+        return
+    for handler in (
+        MessageHandler,
+        CallbackQueryHandler,
+        ChatMemberUpdatedHandler,
+        InlineQueryHandler,
+    ):
+        app.add_handler(handler(_guard), SHARD_GROUP)
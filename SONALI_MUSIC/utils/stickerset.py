@@ -40,12 +40,18 @@ async def add_sticker_to_set(
     client: Client,
     stickerset: raw.base.messages.StickerSet,
     sticker: raw.base.InputStickerSetItem,
+) -> raw.base.messages.StickerSet:
+    return await add_sticker_by_name(client, stickerset.set.short_name, sticker)
+
+
+async def add_sticker_by_name(
+    client: Client,
+    short_name: str,
+    sticker: raw.base.InputStickerSetItem,
 ) -> raw.base.messages.StickerSet:
     return await client.invoke(
         raw.functions.stickers.AddStickerToSet(
-            stickerset=raw.types.InputStickerSetShortName(
-                short_name=stickerset.set.short_name
-            ),
+            stickerset=raw.types.InputStickerSetShortName(short_name=short_name),
             sticker=sticker,
         )
     )
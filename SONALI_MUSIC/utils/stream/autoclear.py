@@ -1,6 +1,7 @@
 import os
 
 from config import autoclean
+from SONALI_MUSIC.utils.stream.playback import remove_variants
 
 
 async def auto_clean(popped):
@@ -14,5 +15,6 @@ async def auto_clean(popped):
                     os.remove(rem)
                 except:
                     pass
+                remove_variants(rem)
     except:
         pass
@@ -0,0 +1,123 @@
+import asyncio
+import os
+
+import config
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.scheduler import scheduler
+
+PLAYBACK_DIR = os.path.join(os.getcwd(), "playback")
+
+rendering = {}
+
+
+def speed_filter(speed) -> str:
+    speed = float(speed)
+    return f"-atmid -filter:a atempo={speed} -filter:v setpts={round(1 / speed, 3)}*PTS"
+
+
+def variant_path(file_path: str, speed) -> str:
+    return os.path.join(PLAYBACK_DIR, str(speed), os.path.basename(file_path))
+
+
+def get_variant(file_path: str, speed):
+    out = variant_path(file_path, speed)
+    if out in rendering or not os.path.isfile(out):
+        return None
+    try:
+        os.utime(out)
+    except OSError:
+        return None
+    return out
+
+
+def prerender(file_path: str, speed):
+    if config.SPEED_PRERENDER != str(True):
+        return
+    out = variant_path(file_path, speed)
+    if out in rendering or os.path.isfile(out):
+        return
+    rendering[out] = asyncio.create_task(_render(file_path, speed, out))
+
+
+async def _render(file_path: str, speed, out: str):
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    part = os.path.join(os.path.dirname(out), f".{os.path.basename(out)}")
+    speed = float(speed)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-nostdin",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            file_path,
+            "-filter:v",
+            f"setpts={round(1 / speed, 3)}*PTS",
+            "-filter:a",
+            f"atempo={speed}",
+            part,
+            stdin=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, err = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        if proc.returncode == 0:
+            os.replace(part, out)
+            # Renders finishing close together share one walk of the directory.
+            if not scheduler.pending("playback_budget"):
+                scheduler.schedule("playback_budget", 30, enforce_budget)
+        else:
+            LOGGER(__name__).warning(f"Speed pre-render failed: {err.decode()[-200:]}")
+    except Exception as e:
+        LOGGER(__name__).warning(f"Speed pre-render failed: {e}")
+    finally:
+        rendering.pop(out, None)
+        if os.path.exists(part):
+            os.remove(part)
+
+
+def enforce_budget():
+    trim_directory(PLAYBACK_DIR, config.SPEED_CACHE_LIMIT, rendering)
+
+
+def trim_directory(directory: str, limit: int, busy=()):
+    # Drops the least recently used files until the directory fits in `limit` MB.
+    limit = limit * 1024 * 1024
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            if name.startswith(".") or path in busy:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def remove_variants(file_path: str):
+    if not os.path.isdir(PLAYBACK_DIR):
+        return
+    base = os.path.basename(file_path)
+    for speed in os.listdir(PLAYBACK_DIR):
+        out = os.path.join(PLAYBACK_DIR, speed, base)
+        if out in rendering:
+            rendering[out].cancel()
+        try:
+            os.remove(out)
+        except OSError:
+            pass
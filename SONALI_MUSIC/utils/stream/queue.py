@@ -1,4 +1,5 @@
 import asyncio
+from collections import deque
 from typing import Union
 
 from SONALI_MUSIC.misc import db
@@ -6,6 +7,88 @@ from SONALI_MUSIC.utils.formatters import check_duration, seconds_to_min
 from config import autoclean, time_to_seconds
 
 
+class Track:
+    __slots__ = (
+        "title",
+        "dur",
+        "streamtype",
+        "by",
+        "user_id",
+        "chat_id",
+        "file",
+        "vidid",
+        "seconds",
+        "played",
+        "old_dur",
+        "old_second",
+        "speed",
+        "speed_path",
+        "mystic",
+        "markup",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        dur: str,
+        streamtype: str,
+        by: str,
+        chat_id: int,
+        file: str,
+        vidid: str,
+        seconds: int,
+        user_id: int = None,
+    ):
+        self.title = title
+        self.dur = dur
+        self.streamtype = streamtype
+        self.by = by
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.file = file
+        self.vidid = vidid
+        self.seconds = seconds
+        self.played = 0
+        self.old_dur = None
+        self.old_second = None
+        self.speed = None
+        self.speed_path = None
+        self.mystic = None
+        self.markup = None
+
+    # Item access keeps the old dict style call sites working.
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+class Queue(deque):
+    __slots__ = ()
+
+    def pop(self, index: int = -1) -> Track:
+        if index == 0:
+            return self.popleft()
+        if index == -1:
+            return super().pop()
+        track = self[index]
+        del self[index]
+        return track
+
+    def skip(self, count: int) -> list:
+        return [self.popleft() for _ in range(min(count, len(self)))]
+
+
 async def put_queue(
     chat_id,
     original_chat_id,
@@ -23,27 +106,25 @@ async def put_queue(
         duration_in_seconds = time_to_seconds(duration) - 3
     except:
         duration_in_seconds = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "user_id": user_id,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": duration_in_seconds,
-        "played": 0,
-    }
+    put = Track(
+        title,
+        duration,
+        stream,
+        user,
+        original_chat_id,
+        file,
+        vidid,
+        duration_in_seconds,
+        user_id=user_id,
+    )
     if forceplay:
         check = db.get(chat_id)
         if check:
-            check.insert(0, put)
+            check.appendleft(put)
         else:
-            db[chat_id] = []
-            db[chat_id].append(put)
+            db[chat_id] = Queue([put])
     else:
-        db[chat_id].append(put)
+        db.setdefault(chat_id, Queue()).append(put)
     autoclean.append(file)
 
 
@@ -69,23 +150,12 @@ async def put_queue_index(
             dur = 0
     else:
         dur = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": dur,
-        "played": 0,
-    }
+    put = Track(title, duration, stream, user, original_chat_id, file, vidid, dur)
     if forceplay:
         check = db.get(chat_id)
         if check:
-            check.insert(0, put)
+            check.appendleft(put)
         else:
-            db[chat_id] = []
-            db[chat_id].append(put)
+            db[chat_id] = Queue([put])
     else:
-        db[chat_id].append(put)
+        db.setdefault(chat_id, Queue()).append(put)
@@ -0,0 +1,147 @@
+import asyncio
+
+from aiohttp import web
+
+import config
+from SONALI_MUSIC import YouTube
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.platforms.Youtube import manifest_cache
+
+# vidid -> LiveRelay, one ingest per live source shared by every chat
+relays = {}
+runner = None
+starting = asyncio.Lock()
+# every shard runs its own relay, so each listens on its own port
+PORT = config.LIVE_RELAY_PORT + config.SHARD_ID
+
+CHUNK = 188 * 348
+
+
+class LiveRelay:
+    def __init__(self, vidid: str, source: str):
+        self.vidid = vidid
+        self.source = source
+        self.listeners = set()
+        self.proc = None
+        self.teardown = None
+
+    async def start(self):
+        self.proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-nostdin",
+            "-loglevel",
+            "error",
+            "-i",
+            self.source,
+            "-c",
+            "copy",
+            "-f",
+            "mpegts",
+            "pipe:1",
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        asyncio.create_task(self.pump())
+        self.linger()
+
+    async def pump(self):
+        try:
+            while True:
+                try:
+                    chunk = await self.proc.stdout.readexactly(CHUNK)
+                except asyncio.IncompleteReadError as e:
+                    chunk = e.partial
+                if not chunk:
+                    break
+                for queue in self.listeners:
+                    if not queue.full():
+                        queue.put_nowait(chunk)
+        finally:
+            LOGGER(__name__).info(f"Live relay for {self.vidid} stopped.")
+            if relays.get(self.vidid) is self:
+                relays.pop(self.vidid)
+            manifest_cache.pop(self.vidid)
+            for queue in self.listeners:
+                while queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+            self.stop()
+
+    def attach(self) -> asyncio.Queue:
+        if self.teardown:
+            self.teardown.cancel()
+            self.teardown = None
+        queue = asyncio.Queue(maxsize=256)
+        self.listeners.add(queue)
+        return queue
+
+    def detach(self, queue: asyncio.Queue):
+        self.listeners.discard(queue)
+        if not self.listeners:
+            self.linger()
+
+    def linger(self):
+        # Nobody is listening, keep the ingest warm for a bit then drop it.
+        if not self.listeners and not self.teardown:
+            self.teardown = asyncio.get_running_loop().call_later(
+                config.LIVE_RELAY_LINGER, self.stop
+            )
+
+    def stop(self):
+        if self.proc and self.proc.returncode is None:
+            self.proc.kill()
+
+
+async def serve(request: web.Request):
+    relay = relays.get(request.match_info["vidid"])
+    if not relay:
+        raise web.HTTPNotFound()
+    queue = relay.attach()
+    response = web.StreamResponse(headers={"Content-Type": "video/mp2t"})
+    try:
+        await response.prepare(request)
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            await response.write(chunk)
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        relay.detach(queue)
+    return response
+
+
+async def start_server():
+    global runner
+    async with starting:
+        if runner:
+            return
+        server = web.Application()
+        server.router.add_get("/live/{vidid}", serve)
+        site_runner = web.AppRunner(server, access_log=None)
+        await site_runner.setup()
+        try:
+            await web.TCPSite(site_runner, "127.0.0.1", PORT).start()
+        except Exception:
+            await site_runner.cleanup()
+            raise
+        runner = site_runner
+    LOGGER(__name__).info(f"Live relay listening on port {PORT}.")
+
+
+async def live_url(vidid: str):
+    # Local url every call reads the live stream from, None if it can't resolve.
+    await start_server()
+    if vidid not in relays:
+        try:
+            source = await YouTube.manifest(vidid, True)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Live manifest for {vidid} failed: {e}")
+            return None
+        if not source:
+            return None
+        if vidid not in relays:
+            relays[vidid] = LiveRelay(vidid, source)
+            await relays[vidid].start()
+    return f"http://127.0.0.1:{PORT}/live/{vidid}"
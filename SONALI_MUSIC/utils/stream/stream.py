@@ -1,5 +1,4 @@
 import os
-from random import randint
 from typing import Union
 
 from pyrogram.types import InlineKeyboardMarkup
@@ -12,7 +11,8 @@ from SONALI_MUSIC.utils.database import add_active_video_chat, is_active_chat
 from SONALI_MUSIC.utils.exceptions import AssistantErr
 from SONALI_MUSIC.utils.inline import aq_markup, close_markup, stream_markup
 from SONALI_MUSIC.utils.pastebin import SonaBin
-from SONALI_MUSIC.utils.stream.queue import put_queue, put_queue_index
+from SONALI_MUSIC.utils.stream.queue import Queue, put_queue, put_queue_index
+from SONALI_MUSIC.utils.stream.relay import live_url
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 
 
@@ -71,7 +71,7 @@ async def stream(
                 msg += f"{_['play_20']} {position}\n\n"
             else:
                 if not forceplay:
-                    db[chat_id] = []
+                    db[chat_id] = Queue()
                 status = True if video else None
                 try:
                     file_path, direct = await YouTube.download(
@@ -112,7 +112,7 @@ async def stream(
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "stream"
         if count == 0:
             return
@@ -123,7 +123,7 @@ async def stream(
                 car = os.linesep.join(msg.split(os.linesep)[:17])
             else:
                 car = msg
-            carbon = await Carbon.generate(car, randint(100, 10000000))
+            carbon = await Carbon.generate(car)
             upl = close_markup(_)
             return await app.send_photo(
                 original_chat_id,
@@ -165,7 +165,7 @@ async def stream(
             )
         else:
             if not forceplay:
-                db[chat_id] = []
+                db[chat_id] = Queue()
             await Sona.join_call(
                 chat_id,
                 original_chat_id,
@@ -199,7 +199,7 @@ async def stream(
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "stream"
     elif streamtype == "soundcloud":
         file_path = result["filepath"]
@@ -226,7 +226,7 @@ async def stream(
             )
         else:
             if not forceplay:
-                db[chat_id] = []
+                db[chat_id] = Queue()
             await Sona.join_call(chat_id, original_chat_id, file_path, video=None)
             await put_queue(
                 chat_id,
@@ -250,7 +250,7 @@ async def stream(
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
     elif streamtype == "telegram":
         file_path = result["path"]
@@ -279,7 +279,7 @@ async def stream(
             )
         else:
             if not forceplay:
-                db[chat_id] = []
+                db[chat_id] = Queue()
             await Sona.join_call(chat_id, original_chat_id, file_path, video=status)
             await put_queue(
                 chat_id,
@@ -303,7 +303,7 @@ async def stream(
                 caption=_["stream_1"].format(link, title[:23], duration_min, user_name),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
     elif streamtype == "live":
         link = result["link"]
@@ -333,9 +333,9 @@ async def stream(
             )
         else:
             if not forceplay:
-                db[chat_id] = []
-            n, file_path = await YouTube.video(link)
-            if n == 0:
+                db[chat_id] = Queue()
+            file_path = await live_url(vidid)
+            if not file_path:
                 raise AssistantErr(_["str_3"])
             await Sona.join_call(
                 chat_id,
@@ -370,7 +370,7 @@ async def stream(
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
     elif streamtype == "index":
         link = result
@@ -395,7 +395,7 @@ async def stream(
             )
         else:
             if not forceplay:
-                db[chat_id] = []
+                db[chat_id] = Queue()
             await Sona.join_call(
                 chat_id,
                 original_chat_id,
@@ -421,6 +421,6 @@ async def stream(
                 caption=_["stream_2"].format(user_name),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
             await mystic.delete()
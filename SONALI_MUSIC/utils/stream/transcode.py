@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+from pytgcalls.types.input_stream import AudioPiped, InputAudioStream, InputStream
+from pytgcalls.types.input_stream.quality import HighQualityAudio
+
+import config
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.stream.playback import trim_directory
+
+RAW_DIR = os.path.join(os.getcwd(), "downloads", "raw")
+
+transcoding = {}
+
+
+def raw_path(file_path: str) -> str:
+    return os.path.join(RAW_DIR, f"{os.path.basename(file_path)}.raw")
+
+
+def get_raw(file_path: str):
+    out = raw_path(file_path)
+    if out in transcoding or not os.path.isfile(out):
+        return None
+    try:
+        os.utime(out)
+    except OSError:
+        return None
+    return out
+
+
+def transcode(file_path: str):
+    if config.RAW_AUDIO_CACHE != str(True):
+        return
+    if not os.path.isfile(file_path):
+        return
+    out = raw_path(file_path)
+    if out in transcoding or os.path.isfile(out):
+        return
+    transcoding[out] = asyncio.create_task(_transcode(file_path, out))
+
+
+async def _transcode(file_path: str, out: str):
+    os.makedirs(RAW_DIR, exist_ok=True)
+    part = os.path.join(RAW_DIR, f".{os.path.basename(out)}")
+    params = HighQualityAudio()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-nostdin",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            file_path,
+            "-vn",
+            "-f",
+            "s16le",
+            "-ac",
+            str(params.channels),
+            "-ar",
+            str(params.bitrate),
+            part,
+            stdin=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, err = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        if proc.returncode == 0:
+            os.replace(part, out)
+            trim_directory(RAW_DIR, config.RAW_CACHE_LIMIT, transcoding)
+        else:
+            LOGGER(__name__).warning(f"Raw transcode failed: {err.decode()[-200:]}")
+    except Exception as e:
+        LOGGER(__name__).warning(f"Raw transcode failed: {e}")
+    finally:
+        transcoding.pop(out, None)
+        if os.path.exists(part):
+            os.remove(part)
+
+
+def audio_stream(file_path: str):
+    # Plays the pre-decoded PCM directly when we have it, no ffmpeg per call.
+    raw = get_raw(file_path)
+    if raw:
+        return InputStream(InputAudioStream(raw, HighQualityAudio()))
+    transcode(file_path)
+    return AudioPiped(file_path, audio_parameters=HighQualityAudio())
+
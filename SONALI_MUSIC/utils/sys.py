@@ -1,15 +1,53 @@
+import asyncio
 import time
 
 import psutil
 
+import config
+from SONALI_MUSIC.logging import LOGGER
 from SONALI_MUSIC.misc import _boot_
 from SONALI_MUSIC.utils.formatters import get_readable_time
 
+# Latest numbers collected by sample_stats, read by /ping and /stats.
+stats_snapshot = {}
+
 
 async def bot_sys_stats():
     bot_uptime = int(time.time() - _boot_)
     UP = f"{get_readable_time(bot_uptime)}"
-    CPU = f"{psutil.cpu_percent(interval=0.5)}%"
-    RAM = f"{psutil.virtual_memory().percent}%"
-    DISK = f"{psutil.disk_usage('/').percent}%"
+    if not stats_snapshot:
+        await sample_once()
+    CPU = f"{stats_snapshot['cpu']}%"
+    RAM = f"{stats_snapshot['ram']}%"
+    DISK = f"{stats_snapshot['disk'].percent}%"
     return UP, CPU, RAM, DISK
+
+
+async def sample_once():
+    stats_snapshot["cpu"] = psutil.cpu_percent(interval=None)
+    stats_snapshot["ram"] = psutil.virtual_memory().percent
+    stats_snapshot["disk"] = psutil.disk_usage("/")
+
+
+async def sample_stats():
+    from SONALI_MUSIC.core.call import Sona
+    from SONALI_MUSIC.core.mongo import mongodb
+    from SONALI_MUSIC.utils.database import chatsdb, usersdb
+
+    # The first non-blocking cpu_percent call has nothing to compare against.
+    psutil.cpu_percent(interval=None)
+    await asyncio.sleep(1)
+    while True:
+        try:
+            await sample_once()
+            stats_snapshot["ping"] = await Sona.ping()
+            stats_snapshot["dbstats"] = await mongodb.command("dbstats")
+            stats_snapshot["served_chats"] = await chatsdb.count_documents(
+                {"chat_id": {"$lt": 0}}
+            )
+            stats_snapshot["served_users"] = await usersdb.count_documents(
+                {"user_id": {"$gt": 0}}
+            )
+        except Exception as e:
+            LOGGER(__name__).warning(f"Stats sampling failed: {e}")
+        await asyncio.sleep(config.STATS_SAMPLE_INTERVAL)
@@ -1,5 +1,7 @@
 import os
 import re
+from functools import lru_cache
+from io import BytesIO
 import aiofiles
 import aiohttp
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
@@ -138,3 +140,127 @@ async def get_thumb(videoid: str) -> str:
     return cache_path
 
     
+
+
+def compose_couple(p1: str, p2: str, out: str) -> str:
+    # Runs in the worker pool, pastes both profile photos as circles on the card.
+    img = Image.open("SONALI_MUSIC/assets/cppic.png")
+    for path, pos in ((p1, (91, 215)), (p2, (805, 215))):
+        pfp = Image.open(path).convert("RGBA").resize((390, 390))
+        mask = Image.new("L", pfp.size, 0)
+        ImageDraw.Draw(mask).ellipse((0, 0) + pfp.size, fill=255)
+        pfp.putalpha(mask)
+        img.paste(pfp, pos, pfp)
+    img.save(out)
+    return out
+
+
+@lru_cache(maxsize=4)
+def _background(path: str):
+    return Image.open(path).convert("RGBA")
+
+
+def render_userinfo(bg_path: str, profile_path, out: str) -> str:
+    bg = _background(bg_path).copy()
+    if profile_path:
+        img = Image.open(profile_path).convert("RGBA")
+        mask = Image.new("L", img.size, 0)
+        ImageDraw.Draw(mask).pieslice([(0, 0), img.size], 0, 360, fill=255)
+        circular_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
+        circular_img.paste(img, (0, 0), mask)
+        resized = circular_img.resize((534, 534))
+        bg.paste(resized, (607, 86), resized)
+    bg.save(out)
+    return out
+
+
+QUOTE_COLORS = ("#ff8a80", "#ffd180", "#a7ffeb", "#80d8ff", "#b388ff", "#f8bbd0", "#ccff90")
+
+
+def _wrap(text: str, font: ImageFont.FreeTypeFont, max_w: int) -> list:
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if font.getlength(candidate) <= max_w:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while len(word) > 1 and font.getlength(word) > max_w:
+                cut = next(
+                    (i for i in range(len(word) - 1, 0, -1) if font.getlength(word[:i]) <= max_w),
+                    1,
+                )
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def render_quote(items: list) -> bytes:
+    # Runs in the worker pool, local stand-in for the quotly api. Every item is
+    # {"id", "name", "text", "avatar": path or None, "reply": (name, text) or None}.
+    name_font = ImageFont.truetype("SONALI_MUSIC/assets/font.ttf", 30)
+    text_font = ImageFont.truetype("SONALI_MUSIC/assets/font.ttf", 28)
+    avatar, pad, gap, line_h, max_w = 80, 20, 16, 36, 560
+
+    blocks = []
+    for item in items:
+        name = item["name"] or "Anonymous"
+        lines = _wrap(item["text"] or " ", text_font, max_w)
+        reply = []
+        if item.get("reply"):
+            reply = [trim_to_width(": ".join(item["reply"]), text_font, max_w - 16)]
+        width = max(
+            [name_font.getlength(name)]
+            + [text_font.getlength(line) for line in lines]
+            + [text_font.getlength(line) + 16 for line in reply]
+        )
+        height = line_h + 2 + line_h * (len(lines) + len(reply))
+        blocks.append((item, name, lines, reply, int(width) + 2 * pad, height + 2 * pad))
+
+    img = Image.new(
+        "RGBA",
+        (
+            avatar + gap + max(b[4] for b in blocks),
+            sum(b[5] for b in blocks) + gap * (len(blocks) - 1),
+        ),
+        (0, 0, 0, 0),
+    )
+    draw = ImageDraw.Draw(img)
+    mask = Image.new("L", (avatar, avatar), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, avatar, avatar), fill=255)
+    y = 0
+    for item, name, lines, reply, w, h in blocks:
+        color = QUOTE_COLORS[abs(item["id"]) % len(QUOTE_COLORS)]
+        try:
+            pfp = Image.open(item["avatar"]).convert("RGBA").resize((avatar, avatar))
+        except Exception:
+            pfp = Image.new("RGBA", (avatar, avatar), color)
+        img.paste(pfp, (0, y + h - avatar), mask)
+        x = avatar + gap
+        draw.rounded_rectangle((x, y, x + w, y + h), radius=24, fill="#1b1429")
+        ty = y + pad
+        draw.text((x + pad, ty), name, font=name_font, fill=color)
+        ty += line_h + 2
+        for line in reply:
+            draw.line((x + pad, ty + 4, x + pad, ty + line_h - 4), fill=color, width=4)
+            draw.text((x + pad + 16, ty), line, font=text_font, fill="#b0b0b0")
+            ty += line_h
+        for line in lines:
+            draw.text((x + pad, ty), line, font=text_font, fill="white")
+            ty += line_h
+        y += h + gap
+
+    # Stickers want the longest side at exactly 512 pixels.
+    scale = 512 / max(img.size)
+    img = img.resize(
+        (max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+        Image.LANCZOS,
+    )
+    out = BytesIO()
+    img.save(out, "WEBP")
+    return out.getvalue()
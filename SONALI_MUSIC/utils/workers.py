@@ -0,0 +1,73 @@
+import asyncio
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+from SONALI_MUSIC.logging import LOGGER
+
+_pools = {}
+
+
+def _timeout(signum, frame):
+    raise TimeoutError("worker job timed out")
+
+
+def _run(func, timeout, args, kwargs):
+    # Runs inside the worker process, the alarm kills jobs stuck on the network.
+    if timeout:
+        signal.signal(signal.SIGALRM, _timeout)
+        signal.alarm(int(timeout))
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if timeout:
+            signal.alarm(0)
+
+
+def _ping():
+    return True
+
+
+def get_pool(name: str = "render") -> ProcessPoolExecutor:
+    # yt-dlp downloads get their own pool so they can't hold up the short renders.
+    pool = _pools.get(name)
+    if pool is None or getattr(pool, "_broken", False):
+        size = config.DOWNLOAD_WORKER_PROCESSES if name == "download" else config.WORKER_PROCESSES
+        pool = _pools[name] = ProcessPoolExecutor(max_workers=size)
+    return pool
+
+
+async def start_workers():
+    # Fork the workers before the clients spin up their threads.
+    await run_in_worker(_ping)
+    await run_in_worker(_ping, pool="download")
+    LOGGER(__name__).info(
+        f"Started {config.WORKER_PROCESSES + config.DOWNLOAD_WORKER_PROCESSES} Worker Processes."
+    )
+
+
+async def run_in_worker(func, *args, timeout: int = None, pool: str = "render", **kwargs):
+    future = None
+    try:
+        future = get_pool(pool).submit(_run, func, timeout, args, kwargs)
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future),
+            timeout + 5 if timeout else None,
+        )
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        if future:
+            future.cancel()
+        raise
+    except BrokenProcessPool:
+        LOGGER(__name__).warning("Worker pool broke, restarting it.")
+        broken = _pools.pop(pool, None)
+        if broken:
+            broken.shutdown(wait=False)
+        raise
+
+
+def stop_workers():
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
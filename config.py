@@ -40,6 +40,48 @@ SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", "709e1a2969664491b582008
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
 TG_AUDIO_FILESIZE_LIMIT = int(getenv("TG_AUDIO_FILESIZE_LIMIT", "5242880000"))
 TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", "5242880000"))
+TG_DOWNLOAD_PARTS = int(getenv("TG_DOWNLOAD_PARTS", "4"))
+WORKER_PROCESSES = int(getenv("WORKER_PROCESSES", "2"))
+DOWNLOAD_WORKER_PROCESSES = int(getenv("DOWNLOAD_WORKER_PROCESSES", "2"))
+YTDL_EXTRACT_TIMEOUT = int(getenv("YTDL_EXTRACT_TIMEOUT", "60"))
+YTDL_DOWNLOAD_TIMEOUT = int(getenv("YTDL_DOWNLOAD_TIMEOUT", "600"))
+YTDL_INFO_CACHE_TTL = int(getenv("YTDL_INFO_CACHE_TTL", "600"))
+SLIDER_CACHE_TTL = int(getenv("SLIDER_CACHE_TTL", "300"))
+SPEED_PRERENDER = getenv("SPEED_PRERENDER", "False")
+SPEED_CACHE_LIMIT = int(getenv("SPEED_CACHE_LIMIT", "1024"))
+RAW_AUDIO_CACHE = getenv("RAW_AUDIO_CACHE", "False")
+RAW_CACHE_LIMIT = int(getenv("RAW_CACHE_LIMIT", "4096"))
+TIMER_EDITS_PER_SECOND = int(getenv("TIMER_EDITS_PER_SECOND", "20"))
+STATS_SAMPLE_INTERVAL = int(getenv("STATS_SAMPLE_INTERVAL", "15"))
+CARBON_REMOTE_FALLBACK = getenv("CARBON_REMOTE_FALLBACK", "True")
+CARBON_CACHE_SIZE = int(getenv("CARBON_CACHE_SIZE", "256"))
+CHAT_CACHE_TTL = int(getenv("CHAT_CACHE_TTL", "3600"))
+ROSTER_TTL = int(getenv("ROSTER_TTL", "86400"))
+ROSTER_CACHE_SIZE = int(getenv("ROSTER_CACHE_SIZE", "256"))
+INFO_CARD_CACHE_TTL = int(getenv("INFO_CARD_CACHE_TTL", "86400"))
+LAZY_PLUGINS = getenv("LAZY_PLUGINS", "True")
+COMMAND_ROUTER = getenv("COMMAND_ROUTER", "True")
+LIVE_MANIFEST_TTL = int(getenv("LIVE_MANIFEST_TTL", "1800"))
+LIVE_RELAY_PORT = int(getenv("LIVE_RELAY_PORT", "8790"))
+LIVE_RELAY_LINGER = int(getenv("LIVE_RELAY_LINGER", "30"))
+TTS_CACHE_TTL = int(getenv("TTS_CACHE_TTL", "86400"))
+TTS_CACHE_SIZE = int(getenv("TTS_CACHE_SIZE", "2048"))
+TR_CACHE_TTL = int(getenv("TR_CACHE_TTL", "86400"))
+TR_CACHE_SIZE = int(getenv("TR_CACHE_SIZE", "4096"))
+QUOTE_CACHE_TTL = int(getenv("QUOTE_CACHE_TTL", "86400"))
+QUOTE_REMOTE_TIMEOUT = int(getenv("QUOTE_REMOTE_TIMEOUT", "8"))
+QUOTE_LOCAL_FALLBACK = getenv("QUOTE_LOCAL_FALLBACK", "True")
+STICKER_CACHE_SIZE = int(getenv("STICKER_CACHE_SIZE", "128"))
+AVATAR_CACHE_SIZE = int(getenv("AVATAR_CACHE_SIZE", "512"))
+PFP_CACHE_SIZE = int(getenv("PFP_CACHE_SIZE", "256"))
+# Join requests approved per second and chat by /autoapprove.
+APPROVE_RATE = int(getenv("APPROVE_RATE", "20"))
+
+# Run SHARD_COUNT processes with their own assistant strings, each one owns the
+# chats whose id % SHARD_COUNT == SHARD_ID. Shards share state through mongo.
+SHARD_COUNT = int(getenv("SHARD_COUNT", "1"))
+SHARD_ID = int(getenv("SHARD_ID", "0"))
+STATE_STORE = getenv("STATE_STORE", "mongo" if SHARD_COUNT > 1 else "memory")
 STRING1 = getenv("STRING_SESSION", None)
 STRING2 = getenv("STRING_SESSION2", None)
 STRING3 = getenv("STRING_SESSION3", None)
@@ -1,4 +1,5 @@
 import os
+import pickle
 from typing import List
 
 import yaml
@@ -6,23 +7,69 @@ import yaml
 languages = {}
 languages_present = {}
 
+LANGS_DIR = r"./strings/langs/"
+# Parsed and merged language packs, rebuilt whenever a yml file changes.
+PACK_PATH = r"./cache/strings.pack"
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def get_string(lang: str):
     return languages[lang]
 
 
-for filename in os.listdir(r"./strings/langs/"):
+def _stamp():
+    return sorted(
+        (filename, os.stat(LANGS_DIR + filename).st_mtime_ns)
+        for filename in os.listdir(LANGS_DIR)
+        if filename.endswith(".yml")
+    )
+
+
+def _load_pack(stamp):
+    try:
+        with open(PACK_PATH, "rb") as f:
+            pack = pickle.load(f)
+        if pack["stamp"] == stamp:
+            return pack
+    except Exception:
+        pass
+
+
+def _save_pack(stamp):
+    try:
+        os.makedirs(os.path.dirname(PACK_PATH), exist_ok=True)
+        with open(PACK_PATH, "wb") as f:
+            pickle.dump(
+                {
+                    "stamp": stamp,
+                    "languages": languages,
+                    "languages_present": languages_present,
+                },
+                f,
+            )
+    except OSError:
+        pass
+
+
+stamp = _stamp()
+pack = _load_pack(stamp)
+if pack:
+    languages.update(pack["languages"])
+    languages_present.update(pack["languages_present"])
+
+for filename in [] if pack else os.listdir(LANGS_DIR):
     if "en" not in languages:
-        languages["en"] = yaml.safe_load(
-            open(r"./strings/langs/en.yml", encoding="utf8")
+        languages["en"] = yaml.load(
+            open(LANGS_DIR + "en.yml", encoding="utf8"), Loader=Loader
         )
         languages_present["en"] = languages["en"]["name"]
     if filename.endswith(".yml"):
         language_name = filename[:-4]
         if language_name == "en":
             continue
-        languages[language_name] = yaml.safe_load(
-            open(r"./strings/langs/" + filename, encoding="utf8")
+        languages[language_name] = yaml.load(
+            open(LANGS_DIR + filename, encoding="utf8"), Loader=Loader
         )
         for item in languages["en"]:
             if item not in languages[language_name]:
@@ -32,3 +79,6 @@ for filename in os.listdir(r"./strings/langs/"):
     except:
         print("There is some issue with the language file inside bot.")
         exit()
+
+if not pack:
+    _save_pack(stamp)